@@ -0,0 +1,63 @@
+"""
+Synthetic forms exercising the different parts of the serializers.
+"""
+import datetime
+from decimal import Decimal
+
+from django import forms
+from django.forms.extras.widgets import SelectDateWidget
+from django.utils.translation import ugettext_lazy as _
+
+from benchmarks.models import Country
+
+FIELD_FACTORIES = (
+    lambda i: forms.CharField(max_length=100, min_length=2, help_text='Help text %d' % i),
+    lambda i: forms.IntegerField(min_value=0, max_value=1000, required=False),
+    lambda i: forms.DecimalField(max_digits=10, decimal_places=2, initial=Decimal('1.50')),
+    lambda i: forms.EmailField(required=False, widget=forms.TextInput(attrs={'class': 'email', 'size': 40})),
+    lambda i: forms.BooleanField(required=False),
+    lambda i: forms.TimeField(initial=datetime.time(12, 30)),
+    lambda i: forms.ChoiceField(choices=[(x, 'Choice %d' % x) for x in range(10)]),
+    lambda i: forms.CharField(widget=forms.Textarea, required=False),
+)
+
+
+def form_class(name, fields):
+    return type(name, (forms.Form,), dict(fields))
+
+
+def wide_form(size):
+    return form_class('WideForm', (('field_%03d' % i, FIELD_FACTORIES[i % len(FIELD_FACTORIES)](i))
+            for i in range(size)))
+
+
+def choice_form(size):
+    return form_class('ChoiceForm', [
+        ('choice', forms.ChoiceField(choices=[(i, 'Choice %d' % i) for i in range(size)])),
+        ('multiple', forms.MultipleChoiceField(choices=[(i, 'Choice %d' % i) for i in range(size)])),
+    ])
+
+
+def lazy_form(size):
+    return form_class('LazyForm', (('field_%03d' % i, forms.ChoiceField(
+        label=_('Name'),
+        help_text=_('Enter a valid value.'),
+        choices=[('a', _('Yes')), ('b', _('No')), ('c', _('Unknown'))],
+    )) for i in range(size)))
+
+
+def model_choice_form(size):
+    return form_class('ModelChoiceForm', (('country_%d' % i, forms.ModelChoiceField(
+        queryset=Country.objects.all())) for i in range(size)))
+
+
+def date_form(size):
+    return form_class('DateForm', (('date_%d' % i, forms.DateField(required=False,
+        widget=SelectDateWidget(years=range(1900, 2030)))) for i in range(size)))
+
+
+def invalid_data(form_class):
+    """
+    Returns data failing validation for most fields of `form_class`.
+    """
+    return dict((name, 'x' * 200) for name in form_class.base_fields)
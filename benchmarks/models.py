@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class Country(models.Model):
+    name = models.CharField(max_length=100)
+    code = models.CharField(max_length=3)
+
+    class Meta:
+        app_label = 'benchmarks'
+
+    def __unicode__(self):
+        return self.name
+
+
+def seed(rows):
+    Country.objects.all().delete()
+    Country.objects.bulk_create([Country(name='Country %05d' % i, code='%03d' % (i % 1000)) for i in range(rows)])
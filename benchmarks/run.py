@@ -0,0 +1,200 @@
+"""
+Benchmarks for RemoteForm serialization.
+
+Runs every scenario in every mode and reports throughput, latency percentiles,
+objects allocated per serialization, peak memory where tracemalloc is
+available, and database queries:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --iterations 50 --output before.json wide choices
+    python -m benchmarks.run --output after.json --compare before.json
+"""
+from __future__ import print_function
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import timeit
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django
+from django.core.management import call_command
+from django.db import connection, reset_queries
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+PERCENTILES = (50, 90, 99)
+
+
+def setup():
+    if hasattr(django, 'setup'):
+        django.setup()
+        call_command('migrate', run_syncdb=True, interactive=False, verbosity=0)
+    else:
+        call_command('syncdb', interactive=False, verbosity=0)
+
+
+def get_scenarios(options):
+    from benchmarks import forms
+    from benchmarks.models import seed
+
+    seed(options.rows)
+
+    wide_form = forms.wide_form(options.fields)
+
+    return [
+        ('wide', lambda: wide_form()),
+        ('wide_bound_errors', lambda data=forms.invalid_data(wide_form): wide_form(data)),
+        ('choices', lambda form_class=forms.choice_form(options.choices): form_class()),
+        ('lazy', lambda form_class=forms.lazy_form(options.fields): form_class()),
+        ('model_choices', lambda form_class=forms.model_choice_form(options.model_fields): form_class()),
+        ('date', lambda form_class=forms.date_form(options.date_fields): form_class()),
+    ]
+
+
+def get_modes():
+    from django.core.serializers.json import DjangoJSONEncoder
+
+    from django_remote_forms.forms import RemoteForm
+
+    return [
+        ('as_dict', lambda form: RemoteForm(form).as_dict()),
+        ('dumps', lambda form: json.dumps(RemoteForm(form).as_dict(), cls=DjangoJSONEncoder)),
+        ('as_json_bytes', lambda form: RemoteForm(form).as_json_bytes()),
+        ('as_dict_cached', lambda form: RemoteForm(form, cache_schema=True).as_dict()),
+        ('iter_json', lambda form: ''.join(RemoteForm(form).iter_json())),
+        ('iter_json_tables', lambda form: ''.join(RemoteForm(form, choice_tables=True).iter_json())),
+    ]
+
+
+def percentile(timings, percent):
+    timings = sorted(timings)
+    index = int(round((len(timings) - 1) * percent / 100.0))
+    return timings[index]
+
+
+def measure(operation, iterations, warmup):
+    for i in range(warmup):
+        operation()
+
+    timings = []
+    queries = 0
+    for i in range(iterations):
+        reset_queries()
+        timings.append(min(timeit.repeat(operation, number=1, repeat=1)))
+        queries += len(connection.queries)
+
+    # Objects still alive right after a serialization, i.e. mostly the
+    # output tree, measured outside of the timed runs
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    result = operation()
+    allocated_objects = len(gc.get_objects()) - objects_before
+    del result
+
+    peak_bytes = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        operation()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    total = sum(timings)
+    stats = {
+        'iterations': iterations,
+        'ops_per_second': iterations / total if total else None,
+        'mean_ms': total / iterations * 1000,
+        'queries_per_op': float(queries) / iterations,
+        'allocated_objects': allocated_objects,
+        'peak_bytes': peak_bytes,
+    }
+    for percent in PERCENTILES:
+        stats['p%d_ms' % percent] = percentile(timings, percent) * 1000
+
+    return stats
+
+
+def run(options):
+    setup()
+
+    results = []
+    for scenario_name, form_factory in get_scenarios(options):
+        if options.scenarios and scenario_name not in options.scenarios:
+            continue
+
+        for mode_name, serialize in get_modes():
+            stats = measure(lambda: serialize(form_factory()), options.iterations, options.warmup)
+            stats['scenario'] = scenario_name
+            stats['mode'] = mode_name
+            results.append(stats)
+            print_result(stats)
+
+    return {
+        'environment': {
+            'date': datetime.datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        },
+        'options': vars(options),
+        'results': results,
+    }
+
+
+def print_result(stats):
+    print('%-18s %-16s %9.1f ops/s  p50 %8.2f ms  p90 %8.2f ms  p99 %8.2f ms  %8d objects  %6.1f queries' % (
+        stats['scenario'], stats['mode'], stats['ops_per_second'] or 0, stats['p50_ms'], stats['p90_ms'],
+        stats['p99_ms'], stats['allocated_objects'], stats['queries_per_op']))
+
+
+def compare(results, previous):
+    """
+    Prints the change of mean latency against a previous run.
+    """
+    previous_results = dict(((x['scenario'], x['mode']), x) for x in previous['results'])
+
+    print()
+    print('Mean latency compared to %s' % previous['environment']['date'])
+    for stats in results['results']:
+        before = previous_results.get((stats['scenario'], stats['mode']))
+        if before is None:
+            continue
+
+        print('%-18s %-16s %8.2f ms -> %8.2f ms  (%+.1f%%)' % (stats['scenario'], stats['mode'],
+            before['mean_ms'], stats['mean_ms'], (stats['mean_ms'] / before['mean_ms'] - 1) * 100))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scenarios', nargs='*', help='scenarios to run, all by default')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--fields', type=int, default=200, help='fields of the wide and lazy forms')
+    parser.add_argument('--choices', type=int, default=10000, help='entries of the choice lists')
+    parser.add_argument('--rows', type=int, default=1000, help='rows of the model choice table')
+    parser.add_argument('--model-fields', type=int, default=5, help='fields of the model choice form')
+    parser.add_argument('--date-fields', type=int, default=20, help='fields of the date form')
+    parser.add_argument('--output', help='file to write the results to as JSON')
+    parser.add_argument('--compare', help='results of a previous run to compare against')
+    options = parser.parse_args(argv)
+
+    results = run(options)
+
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+    if options.compare:
+        with open(options.compare) as previous:
+            compare(results, json.load(previous))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,28 @@
+# Settings for running the benchmarks against an in-memory database:
+#
+#     python -m benchmarks.run
+
+DEBUG = True  # Needed to count queries
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+}
+
+INSTALLED_APPS = (
+    'django_remote_forms',
+    'benchmarks',
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+USE_I18N = True
+LANGUAGE_CODE = 'en'
+
+SECRET_KEY = 'benchmarks'
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Query counts of model backed fields and round trips of the compact format,
+run against the benchmark settings:
+
+    django-admin.py test benchmarks --settings=benchmarks.settings
+"""
+import datetime
+import unittest
+
+from django import forms
+from django.test import TestCase
+
+from benchmarks.models import Country, seed
+from django_remote_forms import compact
+from django_remote_forms.forms import RemoteForm
+
+
+class CountryForm(forms.Form):
+    country = forms.ModelChoiceField(queryset=Country.objects.all())
+
+
+class ModelChoiceQueriesTest(TestCase):
+    def setUp(self):
+        seed(10)
+
+    def test_field_and_widget_share_one_query(self):
+        with self.assertNumQueries(1):
+            form_dict = RemoteForm(CountryForm()).as_dict()
+
+        field_dict = form_dict['fields']['country']
+        self.assertEqual(len(field_dict['choices']), 11)
+        self.assertEqual(field_dict['widget']['choices'], field_dict['choices'])
+
+    def test_choice_labels_use_one_query(self):
+        remote_form = RemoteForm(CountryForm(), config={'choice_labels': {'country': 'name'}})
+        with self.assertNumQueries(1):
+            form_dict = remote_form.as_dict()
+
+        choices = form_dict['fields']['country']['choices']
+        self.assertEqual(len(choices), 11)
+        self.assertEqual(choices[1]['display'], 'Country 00000')
+        self.assertEqual(form_dict['fields']['country']['widget']['choices'], choices)
+
+
+class ProfileForm(forms.Form):
+    name = forms.CharField(label=u'Prénom', max_length=50, help_text='Your name')
+    country = forms.ChoiceField(choices=[('fr', u'Française'), ('ca', 'Canada')], required=False)
+    age = forms.IntegerField(min_value=0)
+    bio = forms.CharField(widget=forms.Textarea(attrs={'rows': 3}), required=False)
+    born = forms.DateField(initial=datetime.date(1990, 5, 17))
+
+
+class PackTest(TestCase):
+    def assertRoundTrip(self, format):
+        form_dict = RemoteForm(ProfileForm()).as_dict()
+        data = compact.pack(compact.compact(form_dict), format)
+        expanded = compact.expand(compact.unpack(data, format))
+
+        self.assertEqual(expanded, form_dict)
+        self.assertEqual(list(expanded['fields']), list(form_dict['fields']))
+        for name, field_dict in form_dict['fields'].items():
+            self.assertEqual(list(expanded['fields'][name]), list(field_dict))
+            self.assertEqual(list(expanded['fields'][name]['widget']), list(field_dict['widget']))
+
+    @unittest.skipIf(compact.msgpack is None, 'msgpack is not installed')
+    def test_msgpack_round_trip(self):
+        self.assertRoundTrip('msgpack')
+
+    @unittest.skipIf(compact.cbor2 is None, 'cbor2 is not installed')
+    def test_cbor_round_trip(self):
+        self.assertRoundTrip('cbor')
@@ -1,8 +1,12 @@
 __author__ = 'Carlo Costino, Tareque Hossain'
 __version__ = (0, 0, 1)
 
+# Django >= 1.7
+default_app_config = 'django_remote_forms.apps.RemoteFormsConfig'
+
 import logging
 logger = logging.getLogger(__name__)
 
 from .forms import RemoteForm
+from .formsets import RemoteFormSet
 from .widgets import RemoteWidget
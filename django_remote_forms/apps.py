@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class RemoteFormsConfig(AppConfig):
+    name = 'django_remote_forms'
+    verbose_name = 'Remote Forms'
+
+    def ready(self):
+        # Building schemas may query the database for choices, so warming up
+        # in every worker is opt-in. Where the shared schema cache already
+        # holds them, schemas are only loaded.
+        if getattr(settings, 'REMOTE_FORMS_WARM_ON_STARTUP', False):
+            from django_remote_forms.warmup import autodiscover, warm_schemas
+
+            autodiscover()
+            warm_schemas()
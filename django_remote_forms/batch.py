@@ -0,0 +1,82 @@
+from Queue import Empty, Queue
+import sys
+import threading
+
+from django.db import connections
+from django.utils import translation
+
+from django_remote_forms import logger
+from django_remote_forms.forms import RemoteForm
+
+
+def serialize_many(forms, max_workers=4, sections=None, field_attrs=None, raise_errors=False):
+    """
+    Returns the `as_dict` of every form in `forms`, in the same order,
+    serializing up to `max_workers` forms at a time in separate threads.
+    Forms are given as RemoteForm instances, or as Django forms which are
+    serialized with the default RemoteForm options. `sections` and
+    `field_attrs` are passed to `as_dict`.
+
+    This pays off when forms block on the database, e.g. to fetch choices.
+    Workers run in the active language of the caller and close their
+    database connections when done. The forms must be independent of each
+    other, as they are serialized concurrently.
+
+    A form that fails to serialize is logged and returns None, unless
+    `raise_errors` is given, in which case the first error is raised once all
+    forms were serialized.
+    """
+    remote_forms = [x if isinstance(x, RemoteForm) else RemoteForm(x) for x in forms]
+    results = [None] * len(remote_forms)
+    errors = [None] * len(remote_forms)
+
+    def serialize(index):
+        try:
+            results[index] = remote_forms[index].as_dict(sections, field_attrs)
+        except Exception, e:
+            logger.error('Error serializing form %s: %s', remote_forms[index].form.__class__.__name__, str(e))
+            errors[index] = sys.exc_info()
+
+    workers = min(max_workers, len(remote_forms))
+    if workers <= 1:
+        for index in range(len(remote_forms)):
+            serialize(index)
+    else:
+        language = translation.get_language()
+
+        queue = Queue()
+        for index in range(len(remote_forms)):
+            queue.put(index)
+
+        def work():
+            if language:
+                translation.activate(language)
+
+            try:
+                while True:
+                    try:
+                        index = queue.get_nowait()
+                    except Empty:
+                        return
+
+                    serialize(index)
+            finally:
+                translation.deactivate()
+
+                # Every thread opens its own connections, which would
+                # otherwise stay open until garbage collected
+                for connection in connections.all():
+                    connection.close()
+
+        threads = [threading.Thread(target=work) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    if raise_errors:
+        for exc_info in errors:
+            if exc_info:
+                raise exc_info[0], exc_info[1], exc_info[2]
+
+    return results
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+import threading
+
+from django.conf import settings
+
+from django_remote_forms import __version__
+from django_remote_forms.utils import fingerprint, get_cache
+
+# Maximum number of schemas and of plans kept in memory
+SCHEMA_CACHE_SIZE = 1024
+
+
+class SchemaCache(object):
+    """
+    An in-process store for the static part of serialized forms.
+
+    Entries are keyed by whatever `RemoteForm.get_schema_key` returns, which
+    starts with the form class so that all entries of a form can be dropped at
+    once with `invalidate`. The least recently used entry is dropped once
+    `max_size` entries are kept, so that form classes created per request,
+    e.g. by `modelform_factory`, neither grow the cache nor stay alive
+    forever.
+
+    Schemas handed out by the cache are shared between requests and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_size=SCHEMA_CACHE_SIZE):
+        self.max_size = max_size
+        self._schemas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                schema = self._schemas.pop(key)
+            except KeyError:
+                return None
+
+            self._schemas[key] = schema
+            return schema
+
+    def set(self, key, schema):
+        with self._lock:
+            self._schemas.pop(key, None)
+            self._schemas[key] = schema
+
+            while len(self._schemas) > self.max_size:
+                self._schemas.popitem(last=False)
+
+    def invalidate(self, form_class=None):
+        """
+        Drops every cached schema of `form_class`, or the whole cache if no
+        form class is given.
+        """
+        with self._lock:
+            if form_class is None:
+                self._schemas.clear()
+                return
+
+            for key in [x for x in self._schemas if x[0] is form_class]:
+                del self._schemas[key]
+
+    def __len__(self):
+        return len(self._schemas)
+
+
+schema_cache = SchemaCache()
+
+# Compiled `FormPlan`s, keyed the same way by form class first
+plan_cache = SchemaCache()
+
+
+class SharedSchemaCache(object):
+    """
+    Schemas stored in the Django cache named by the
+    `REMOTE_FORMS_SCHEMA_CACHE` setting, so that every worker and node using
+    that cache only builds a schema once. Nothing is stored unless the setting
+    is given.
+
+    Keys hold the package version and language besides the hash of
+    everything else the schema depends on. Form definitions are not part of
+    the key, so clear the cache or bump the cache `VERSION` when forms change
+    between deployments.
+    """
+
+    def get_cache(self):
+        alias = getattr(settings, 'REMOTE_FORMS_SCHEMA_CACHE', None)
+        if not alias:
+            return None
+
+        # Backends are looked up on every call as they may be thread bound
+        return get_cache(alias)
+
+    def make_key(self, language, *parts):
+        return 'remote_forms:schema:%s:%s:%s' % ('.'.join(str(x) for x in __version__), language,
+                fingerprint(*parts))
+
+    def get(self, key):
+        cache = self.get_cache()
+        if cache is None:
+            return None
+
+        return cache.get(key)
+
+    def set(self, key, schema):
+        cache = self.get_cache()
+        if cache is None:
+            return
+
+        cache.set(key, schema, getattr(settings, 'REMOTE_FORMS_SCHEMA_CACHE_TIMEOUT', 60 * 60 * 24))
+
+
+shared_schema_cache = SharedSchemaCache()
+
+
+def invalidate_schema(form_class=None):
+    schema_cache.invalidate(form_class)
+    plan_cache.invalidate(form_class)
@@ -0,0 +1,355 @@
+from collections import OrderedDict
+import copy
+import threading
+import uuid
+
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.forms.models import ModelChoiceIterator
+from django.utils.encoding import force_unicode
+from django.utils.functional import Promise
+from django.utils.translation import get_language
+
+from django_remote_forms.utils import ResolvedList, fingerprint, get_cache, resolve_lazy, resolve_promise
+
+try:
+    from django.core.exceptions import EmptyResultSet
+except ImportError:
+    # Django < 1.11
+    from django.db.models.sql.datastructures import EmptyResultSet
+
+# Default number of seconds cached choices are kept, see `ChoiceCache`
+CHOICE_CACHE_TIMEOUT = 300
+
+# Seconds the generation of a model's cached choices is kept
+GENERATION_TIMEOUT = 60 * 60 * 24
+
+# Maximum number of serialized static choice lists kept in memory
+STATIC_CHOICES_CACHE_SIZE = 256
+
+_static_choices_cache = {}
+
+
+def shares_choices(field, widget):
+    """
+    Returns True if `widget` renders the same choices as `field`, which is the
+    case for every choice field whose widget was not given its own choices.
+    """
+    widget_choices = getattr(widget, 'choices', None)
+    if widget_choices is None:
+        return False
+
+    # ChoiceField assigns the very same list to itself and its widget
+    if widget_choices is getattr(field, '_choices', None):
+        return True
+
+    # ModelChoiceField hands its widget an iterator over its own queryset
+    return isinstance(widget_choices, ModelChoiceIterator) and widget_choices.field is field
+
+
+def iter_choices(field, label_field=None):
+    """
+    Yields (value, label) pairs of the choices of `field`.
+
+    For model backed fields, `label_field` names the model field to use as
+    label. The choices are then fetched with `values_list` rather than by
+    instantiating every model object just to call `label_from_instance`.
+    """
+    choices = field.choices
+
+    if label_field and isinstance(choices, ModelChoiceIterator):
+        if field.empty_label is not None:
+            yield (u'', field.empty_label)
+
+        value_field = field.to_field_name or 'pk'
+        for choice in field.queryset.values_list(value_field, label_field):
+            yield choice
+    else:
+        for choice in choices:
+            yield choice
+
+
+def choice_dicts(choices):
+    """
+    Serializes (value, label) pairs, resolving lazy labels right away so that
+    `resolve_promise` can skip the returned list.
+    """
+    language = get_language()
+
+    serialized = ResolvedList()
+    for key, value in choices:
+        if isinstance(value, Promise):
+            value = resolve_lazy(value, language)
+        elif isinstance(value, (list, tuple)):
+            # Grouped choices
+            value = resolve_promise(list(value))
+        serialized.append({'value': key, 'display': value})
+
+    return serialized
+
+
+def static_choice_dicts(choices):
+    """
+    Returns `choice_dicts(choices)` for the list of static choices of a field
+    or widget, memoized per language and choices, so that the choices and
+    their choice table id are serialized once and only copied across
+    requests.
+
+    Forms deep copy the choice lists of their fields, but the copies hold the
+    very same (value, label) tuples, which are therefore compared by
+    identity. Lists holding anything but tuples are serialized every time.
+    """
+    if set(map(type, choices)) - set([tuple]):
+        return choice_dicts(choices)
+
+    key = (get_language(), tuple(map(id, choices)))
+    try:
+        return copy_choice_dicts(_static_choices_cache[key][1])
+    except KeyError:
+        pass
+
+    serialized = choice_dicts(choices)
+    choice_table_id(serialized)
+
+    if len(_static_choices_cache) >= STATIC_CHOICES_CACHE_SIZE:
+        _static_choices_cache.clear()
+
+    # Keep a reference to the choices so that their ids are not reused while
+    # the entry is cached
+    _static_choices_cache[key] = (list(choices), serialized)
+    return copy_choice_dicts(serialized)
+
+
+def copy_choice_dicts(choices):
+    """
+    Copies the serialized `choices` down to the displays of grouped choices,
+    keeping their choice table id.
+    """
+    copied = ResolvedList()
+    for choice in choices:
+        display = choice['display']
+        if isinstance(display, list):
+            display = copy.deepcopy(display)
+        copied.append({'value': choice['value'], 'display': display})
+
+    copied.table_id = getattr(choices, 'table_id', None)
+    return copied
+
+
+def paginate_choices(field, cursor=None, search=None, page_size=50, search_fields=(), label_field=None):
+    """
+    Returns one page of the choices of the model backed `field` as a
+    dictionary of serialized `choices` and the `next_cursor` to pass to get the
+    following page, which is None on the last page.
+
+    Pages are selected by keyset rather than by offset: choices are ordered by
+    their value and a page starts after the value given as `cursor`, so every
+    page costs the same no matter how deep into the queryset it is. `search`
+    narrows the choices down to those containing it in any of
+    `search_fields`.
+    """
+    value_field = field.to_field_name or 'pk'
+    queryset = field.queryset
+
+    if search and search_fields:
+        condition = Q()
+        for search_field in search_fields:
+            condition |= Q(**{'%s__icontains' % search_field: search})
+        queryset = queryset.filter(condition)
+
+    if cursor not in (None, ''):
+        queryset = queryset.filter(**{'%s__gt' % value_field: cursor})
+
+    queryset = queryset.order_by(value_field)[:page_size + 1]
+
+    if label_field:
+        choices = list(queryset.values_list(value_field, label_field))
+    else:
+        choices = [(field.prepare_value(obj), field.label_from_instance(obj)) for obj in queryset]
+
+    next_cursor = None
+    if len(choices) > page_size:
+        choices = choices[:page_size]
+        next_cursor = choices[-1][0]
+
+    # The empty choice only belongs at the top of the unfiltered list
+    if cursor in (None, '') and not search and field.empty_label is not None:
+        choices.insert(0, (u'', field.empty_label))
+
+    return {
+        'choices': choice_dicts(choices),
+        'next_cursor': next_cursor,
+    }
+
+
+def choice_table_id(choices):
+    """
+    Returns the id of the serialized choice list `choices` in a choice table,
+    a hash of its content. The id is remembered by the list and its copies,
+    so memoized lists, see `static_choice_dicts`, are only hashed once.
+    """
+    table_id = getattr(choices, 'table_id', None)
+    if table_id is None:
+        table_id = fingerprint(choices)[:16]
+        if isinstance(choices, ResolvedList):
+            choices.table_id = table_id
+
+    return table_id
+
+
+class ChoiceTables(object):
+    """
+    Collects the distinct choice lists of one serialized form by id, so that
+    fields and widgets can reference a table instead of repeating its choices.
+    """
+
+    def __init__(self):
+        self.tables = OrderedDict()
+
+        # Lists already referenced, by identity, as a field and its widget
+        # usually share the very same list. The list is kept so that its id
+        # is not reused.
+        self._referenced = {}
+
+    def reference(self, choices):
+        """
+        Adds `choices` to the tables if necessary and returns its id.
+        """
+        try:
+            return self._referenced[id(choices)][0]
+        except KeyError:
+            pass
+
+        table_id = choice_table_id(choices)
+        self._referenced[id(choices)] = (table_id, choices)
+        self.tables.setdefault(table_id, choices)
+        return table_id
+
+
+# Cache aliases holding choices of every watched model
+_watched_models = {}
+_watch_lock = threading.Lock()
+
+
+class ChoiceCache(object):
+    """
+    Caches the serialized choices of model backed fields in the Django cache
+    `alias` for `timeout` seconds.
+
+    Entries are keyed by the model, SQL and parameters of the field's queryset,
+    along with everything else the serialized choices depend on, so fields
+    narrowing their queryset per instance are cached separately. Saving or
+    deleting an instance of the model, or changing its many to many
+    relations, invalidates its entries by moving the model to a new
+    generation stored in the same cache, so that every process sharing the
+    cache sees the change.
+
+    Signals are connected for a model once a cache served its choices in the
+    current process. Processes that change the model without serializing its
+    choices, e.g. task workers, should call `watch` for the model.
+    """
+
+    def __init__(self, alias='default', timeout=CHOICE_CACHE_TIMEOUT):
+        self.alias = alias
+        self.timeout = timeout
+
+    def get_choices(self, field, label_field=None):
+        """
+        Returns the serialized choices of the model backed `field`, see
+        `iter_choices` for `label_field`.
+        """
+        queryset = field.queryset
+        try:
+            sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+        except EmptyResultSet:
+            return choice_dicts(iter_choices(field, label_field))
+
+        watch(queryset.model, self.alias)
+
+        # Backends are looked up on every call as they may be thread bound
+        cache = get_cache(self.alias)
+
+        empty_label = field.empty_label
+        if empty_label is not None:
+            empty_label = force_unicode(empty_label)
+
+        key = 'remote_forms:choices:%s' % fingerprint(
+            get_generation(cache, queryset.model), sql, params,
+            '%s.%s' % (field.__class__.__module__, field.__class__.__name__),
+            field.to_field_name, label_field, empty_label, get_language())
+
+        choices = cache.get(key)
+        if choices is None:
+            choices = choice_dicts(iter_choices(field, label_field))
+            cache.set(key, choices, self.timeout)
+
+        return choices
+
+
+def generation_key(model):
+    return 'remote_forms:choices:generation:%s.%s' % (model._meta.app_label, model._meta.object_name)
+
+
+def get_generation(cache, model):
+    """
+    Returns the current generation of the cached choices of `model`.
+    """
+    key = generation_key(model)
+    generation = cache.get(key)
+    if generation is None:
+        # Starting from a random generation rather than 0 means entries of an
+        # evicted generation can never come back
+        cache.add(key, uuid.uuid4().hex, GENERATION_TIMEOUT)
+        generation = cache.get(key)
+
+    return generation
+
+
+def invalidate_choices(model):
+    """
+    Invalidates the cached choices of `model` in every cache they are kept in.
+    """
+    for alias in _watched_models.get(model, ()):
+        get_cache(alias).set(generation_key(model), uuid.uuid4().hex, GENERATION_TIMEOUT)
+
+
+def watch(model, alias='default'):
+    """
+    Invalidates the choices of `model` cached in `alias` whenever the model
+    changes.
+    """
+    aliases = _watched_models.get(model)
+    if aliases is not None and alias in aliases:
+        return
+
+    with _watch_lock:
+        # Another thread may have watched the model meanwhile
+        aliases = _watched_models.get(model)
+        if aliases is not None and alias in aliases:
+            return
+
+        if aliases is None:
+            post_save.connect(_invalidate_sender, sender=model, weak=False,
+                    dispatch_uid='remote_forms_choices_save')
+            post_delete.connect(_invalidate_sender, sender=model, weak=False,
+                    dispatch_uid='remote_forms_choices_delete')
+
+        # Replaced rather than changed, so that signal handlers can read it
+        # without the lock
+        _watched_models[model] = frozenset(aliases or ()) | frozenset([alias])
+
+
+def _invalidate_sender(sender, **kwargs):
+    invalidate_choices(sender)
+
+
+def _invalidate_m2m(sender, instance, action, model, **kwargs):
+    if not action.startswith('post_'):
+        return
+
+    # Either side of the relation may be a watched model
+    invalidate_choices(instance.__class__)
+    invalidate_choices(model)
+
+
+m2m_changed.connect(_invalidate_m2m, weak=False, dispatch_uid='remote_forms_choices_m2m')
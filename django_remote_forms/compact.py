@@ -0,0 +1,353 @@
+"""
+A compact wire format for serialized forms.
+
+Keys of the form, field, widget and choice dictionaries are replaced by
+short aliases, and field and widget keys holding their usual value are left
+out. Which aliases and defaults apply is determined by the profile version
+stored in the `_v` key, so that clients can keep decoding payloads of
+older versions.
+"""
+from collections import OrderedDict
+from io import BytesIO
+
+from django_remote_forms.encoding import default
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+    from cbor2.decoder import decode_uint
+    from cbor2.types import break_marker
+except ImportError:
+    cbor2 = None
+
+VERSION_KEY = '_v'
+
+# Aliases by key, per profile version. Aliases must never be changed once
+# released, add a new version instead.
+ALIASES = {
+    1: {
+        'attrs': 'a',
+        'check_test': 'ct',
+        'choice_label': 'cl',
+        'choice_source': 'cs',
+        'choice_tables': 'tb',
+        'choice_value': 'cv',
+        'choices': 'c',
+        'clear_checkbox_label': 'ccl',
+        'coerce': 'co',
+        'cursor': 'cu',
+        'data': 'dt',
+        'date': 'da',
+        'date_format': 'df',
+        'decimal_places': 'dp',
+        'display': 'd',
+        'empty_value': 'ev',
+        'error_messages': 'em',
+        'errors': 'er',
+        'fields': 'f',
+        'fieldsets': 'fs',
+        'fingerprint': 'fp',
+        'format': 'fm',
+        'help_text': 'h',
+        'index': 'ix',
+        'initial': 'i',
+        'initial_text': 'it',
+        'input_date_formats': 'idf',
+        'input_formats': 'if',
+        'input_text': 'itx',
+        'input_time_formats': 'itf',
+        'input_type': 'ty',
+        'is_bound': 'b',
+        'is_hidden': 'hd',
+        'is_localized': 'lo',
+        'is_required': 'rq',
+        'key': 'k',
+        'label': 'l',
+        'label_suffix': 'ls',
+        'manual_format': 'mf',
+        'match': 'ma',
+        'max_digits': 'md',
+        'max_length': 'xl',
+        'max_value': 'xv',
+        'min_length': 'nl',
+        'min_value': 'nv',
+        'name': 'n',
+        'needs_multipart_form': 'mp',
+        'non_field_errors': 'ne',
+        'page_size': 'ps',
+        'path': 'pa',
+        'prefix': 'p',
+        'readonly': 'ro',
+        'recursive': 're',
+        'regex': 'rx',
+        'required': 'r',
+        'searchable': 'se',
+        'size': 'sz',
+        'time_format': 'tf',
+        'title': 't',
+        'url': 'u',
+        'value': 'v',
+        'widget': 'w',
+        'widgets': 'ws',
+    },
+}
+
+# Values of keys every field and widget dictionary has that are left out,
+# per profile version
+FIELD_DEFAULTS = {
+    1: {
+        'required': True,
+        'help_text': '',
+        'initial': None,
+    },
+}
+
+WIDGET_DEFAULTS = {
+    1: {
+        'is_hidden': False,
+        'needs_multipart_form': False,
+        'is_localized': False,
+        'is_required': True,
+        'attrs': {},
+    },
+}
+
+# Keys every field and widget dictionary starts with, in their serialized
+# order, so that left out keys are put back in place, per profile version
+FIELD_KEYS = {
+    1: ('title', 'required', 'label', 'initial', 'help_text', 'error_messages'),
+}
+
+WIDGET_KEYS = {
+    1: ('title', 'is_hidden', 'needs_multipart_form', 'is_localized', 'is_required', 'attrs'),
+}
+
+CURRENT_VERSION = 1
+
+# Keys whose values are copied as they are, because their own keys are
+# names or codes rather than serializer keys
+OPAQUE_KEYS = frozenset(['attrs', 'data', 'error_messages', 'errors', 'fieldsets', 'initial',
+        'non_field_errors'])
+
+
+class Profile(object):
+    """
+    Encodes and decodes form dictionaries with the aliases and defaults of
+    one profile `version`.
+    """
+
+    def __init__(self, version=CURRENT_VERSION):
+        self.version = version
+        self.aliases = ALIASES[version]
+        self.keys = dict((alias, key) for key, alias in self.aliases.items())
+        self.field_defaults = FIELD_DEFAULTS[version]
+        self.widget_defaults = WIDGET_DEFAULTS[version]
+        self.field_keys = FIELD_KEYS[version]
+        self.widget_keys = WIDGET_KEYS[version]
+
+    def alias(self, key):
+        try:
+            return self.aliases[key]
+        except KeyError:
+            # A key without alias would be taken for the key the alias stands
+            # for when decoding
+            if key in self.keys:
+                raise ValueError('Key %s clashes with an alias' % key)
+            return key
+
+    def compact(self, form_dict):
+        """
+        Returns the compact equivalent of the serialized form `form_dict`, as
+        returned by `RemoteForm.as_dict` without `field_attrs`.
+        """
+        compact_dict = OrderedDict([(VERSION_KEY, self.version)])
+        for key, value in form_dict.items():
+            if key == 'fields':
+                value = OrderedDict((name, self.compact_field(x)) for name, x in value.items())
+            elif key not in OPAQUE_KEYS:
+                value = self.compact_value(value)
+            compact_dict[self.alias(key)] = value
+
+        return compact_dict
+
+    def compact_field(self, field_dict, defaults=None):
+        if defaults is None:
+            defaults = self.field_defaults
+
+        compact_dict = OrderedDict()
+        for key, value in field_dict.items():
+            if key in defaults and value == defaults[key]:
+                continue
+
+            if key == 'widget':
+                value = self.compact_field(value, self.widget_defaults)
+            elif key not in OPAQUE_KEYS:
+                value = self.compact_value(value)
+            compact_dict[self.alias(key)] = value
+
+        return compact_dict
+
+    def compact_value(self, value):
+        if isinstance(value, dict):
+            return OrderedDict((self.alias(k), self.compact_value(v)) for k, v in value.items())
+        elif isinstance(value, (list, tuple)):
+            return [self.compact_value(x) for x in value]
+
+        return value
+
+    def expand(self, compact_dict):
+        """
+        Returns the serialized form encoded by `compact`.
+        """
+        form_dict = OrderedDict()
+        for alias, value in compact_dict.items():
+            if alias == VERSION_KEY:
+                continue
+
+            key = self.keys.get(alias, alias)
+            if key == 'fields':
+                value = OrderedDict((name, self.expand_field(x)) for name, x in value.items())
+            elif key not in OPAQUE_KEYS:
+                value = self.expand_value(value)
+            form_dict[key] = value
+
+        return form_dict
+
+    def expand_field(self, compact_dict, defaults=None, keys=None):
+        if defaults is None:
+            defaults = self.field_defaults
+            keys = self.field_keys
+
+        expanded = OrderedDict()
+        for alias, value in compact_dict.items():
+            key = self.keys.get(alias, alias)
+            if key == 'widget':
+                value = self.expand_field(value, self.widget_defaults, self.widget_keys)
+            elif key not in OPAQUE_KEYS:
+                value = self.expand_value(value)
+            expanded[key] = value
+
+        field_dict = OrderedDict()
+        for key in keys:
+            if key in expanded:
+                field_dict[key] = expanded.pop(key)
+            elif key in defaults:
+                value = defaults[key]
+                field_dict[key] = value.copy() if isinstance(value, dict) else value
+        field_dict.update(expanded)
+
+        return field_dict
+
+    def expand_value(self, value):
+        if isinstance(value, dict):
+            return OrderedDict((self.keys.get(k, k), self.expand_value(v)) for k, v in value.items())
+        elif isinstance(value, (list, tuple)):
+            return [self.expand_value(x) for x in value]
+
+        return value
+
+
+def compact(form_dict, version=CURRENT_VERSION):
+    return Profile(version).compact(form_dict)
+
+
+def expand(compact_dict):
+    """
+    Returns the serialized form encoded in `compact_dict` by `compact` with
+    any profile version.
+    """
+    return Profile(compact_dict[VERSION_KEY]).expand(compact_dict)
+
+
+def text_strings(o):
+    """
+    Returns `o` with its byte strings decoded as UTF-8 at any depth, since
+    binary encoders take byte strings for binary data rather than text.
+    """
+    if isinstance(o, str):
+        return o.decode('utf-8')
+    elif isinstance(o, dict):
+        items = [(text_strings(k), text_strings(v)) for k, v in o.items()]
+        return OrderedDict(items) if isinstance(o, OrderedDict) else dict(items)
+    elif isinstance(o, (list, tuple)):
+        return [text_strings(x) for x in o]
+
+    return o
+
+
+if cbor2 is not None:
+    class OrderedCBORDecoder(cbor2.CBORDecoder):
+        """
+        Decodes CBOR maps as OrderedDicts, which cbor2 decodes as dicts and
+        therefore loses the order of fields.
+        """
+
+        def decode(self, shareable_index=None):
+            position = self.fp.tell()
+            initial_byte = self.fp.read(1)
+            # Maps used as keys are left to cbor2, which makes them hashable
+            if not initial_byte or ord(initial_byte) >> 5 != 5 or self.immutable:
+                self.fp.seek(position)
+                return super(OrderedCBORDecoder, self).decode(shareable_index)
+
+            dictionary = OrderedDict()
+            self.set_shareable(shareable_index, dictionary)
+            length = decode_uint(self, ord(initial_byte) & 31, allow_indefinite=True)
+
+            count = 0
+            while length is None or count < length:
+                immutable = self.immutable
+                self._immutable = True
+                key = self.decode()
+                self._immutable = immutable
+                if key is break_marker:
+                    break
+
+                dictionary[key] = self.decode()
+                count += 1
+
+            if self.object_hook:
+                return self.object_hook(self, dictionary)
+            return dictionary
+
+
+def pack(compact_dict, format='msgpack'):
+    """
+    Encodes `compact_dict` as MessagePack or CBOR, given as `format`, which
+    requires the `msgpack` or `cbor2` package respectively. Byte strings are
+    encoded as text.
+    """
+    if format == 'msgpack':
+        if msgpack is None:
+            raise ImportError('Encoding forms as MessagePack requires the msgpack package')
+        # Without the bin type, byte strings and unicode are both packed as
+        # strings, decoded as unicode by `unpack`
+        return msgpack.packb(compact_dict, default=default, use_bin_type=False)
+    elif format == 'cbor':
+        if cbor2 is None:
+            raise ImportError('Encoding forms as CBOR requires the cbor2 package')
+        return cbor2.dumps(text_strings(compact_dict),
+                default=lambda encoder, o: encoder.encode(text_strings(default(o))))
+
+    raise ValueError('Unknown format %s' % format)
+
+
+def unpack(data, format='msgpack'):
+    """
+    Decodes the result of `pack` into the compact dictionary, with
+    dictionaries in their encoded order.
+    """
+    if format == 'msgpack':
+        if msgpack is None:
+            raise ImportError('Decoding forms from MessagePack requires the msgpack package')
+        return msgpack.unpackb(data, raw=False, object_pairs_hook=OrderedDict)
+    elif format == 'cbor':
+        if cbor2 is None:
+            raise ImportError('Decoding forms from CBOR requires the cbor2 package')
+        return OrderedCBORDecoder(BytesIO(data)).decode()
+
+    raise ValueError('Unknown format %s' % format)
@@ -0,0 +1,126 @@
+from collections import OrderedDict
+import copy
+import threading
+
+# Number of serialized forms kept to compute deltas against
+HISTORY_SIZE = 128
+
+
+class SchemaHistory(object):
+    """
+    The most recently served serialized forms by fingerprint, so that a
+    client holding one of them can be sent the changes rather than the whole
+    form. The least recently used form is dropped once `max_size` forms are
+    kept. Forms handed out are shared and must be treated as read-only.
+    """
+
+    def __init__(self, max_size=HISTORY_SIZE):
+        self.max_size = max_size
+        self._forms = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint):
+        with self._lock:
+            try:
+                form_dict = self._forms.pop(fingerprint)
+            except KeyError:
+                return None
+
+            self._forms[fingerprint] = form_dict
+            return form_dict
+
+    def add(self, fingerprint, form_dict):
+        with self._lock:
+            self._forms.pop(fingerprint, None)
+            self._forms[fingerprint] = form_dict
+
+            while len(self._forms) > self.max_size:
+                self._forms.popitem(last=False)
+
+    def __len__(self):
+        return len(self._forms)
+
+
+schema_history = SchemaHistory()
+
+
+def escape_pointer(key):
+    return unicode(key).replace('~', '~0').replace('/', '~1')
+
+
+def unescape_pointer(token):
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def diff(old, new, path=''):
+    """
+    Returns the list of JSON Patch (RFC 6902) `add`, `remove` and `replace`
+    operations turning the serialized form `old` into `new`.
+
+    Dictionaries are compared key by key. Lists such as choices that only
+    grew at the end get the new items appended, and are replaced as a whole
+    otherwise. A dictionary whose keys changed order, e.g. reordered fields,
+    is replaced as a whole as well, since patches cannot move keys.
+    """
+    if old == new:
+        return []
+
+    if isinstance(old, list) and isinstance(new, list) and new[:len(old)] == old:
+        return [{'op': 'add', 'path': '%s/-' % path, 'value': x} for x in new[len(old):]]
+
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return [{'op': 'replace', 'path': path, 'value': new}]
+
+    common = [x for x in old if x in new]
+    if isinstance(new, OrderedDict) and common != [x for x in new if x in old]:
+        return [{'op': 'replace', 'path': path, 'value': new}]
+
+    patch = []
+    for key in old:
+        if key not in new:
+            patch.append({'op': 'remove', 'path': '%s/%s' % (path, escape_pointer(key))})
+
+    for key, value in new.items():
+        key_path = '%s/%s' % (path, escape_pointer(key))
+        if key not in old:
+            patch.append({'op': 'add', 'path': key_path, 'value': value})
+        else:
+            patch.extend(diff(old[key], value, key_path))
+
+    return patch
+
+
+def apply_patch(document, patch):
+    """
+    Returns a copy of `document` with the operations of a patch made by
+    `diff` applied, as a reference for clients.
+    """
+    document = copy.deepcopy(document)
+
+    for operation in patch:
+        if not operation['path']:
+            document = copy.deepcopy(operation['value'])
+            continue
+
+        tokens = [unescape_pointer(x) for x in operation['path'].split('/')[1:]]
+        target = document
+        for token in tokens[:-1]:
+            target = target[int(token) if isinstance(target, list) else token]
+
+        key = tokens[-1]
+        value = copy.deepcopy(operation.get('value'))
+        if isinstance(target, list):
+            if key == '-':
+                target.append(value)
+            elif operation['op'] == 'remove':
+                del target[int(key)]
+            elif operation['op'] == 'add':
+                target.insert(int(key), value)
+            else:
+                target[int(key)] = value
+        elif operation['op'] == 'remove':
+            del target[key]
+        else:
+            target[key] = value
+
+    return document
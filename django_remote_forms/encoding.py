@@ -0,0 +1,57 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.functional import Promise
+
+from django_remote_forms.utils import resolve_lazy
+
+try:
+    # simplejson, where installed, has the faster C speedups on older Pythons
+    import simplejson as json
+
+    # Decimals go through `default` like with json, and namedtuples stay
+    # arrays, so the output does not depend on which module is installed
+    DUMPS_OPTIONS = {'use_decimal': False, 'namedtuple_as_object': False}
+except ImportError:
+    import json
+
+    DUMPS_OPTIONS = {}
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def default(o):
+    """
+    Returns a JSON representation of the values found in unresolved form
+    dictionaries that JSON has none for: lazy strings, callables, model
+    instances, plus the dates, times and decimals DjangoJSONEncoder handles.
+    """
+    if isinstance(o, Promise):
+        return resolve_lazy(o)
+
+    # Model instances, e.g. in initial data, are represented by their key
+    if hasattr(o, '_get_pk_val') and not isinstance(o, type):
+        return o._get_pk_val()
+
+    if callable(o):
+        return o()
+
+    return _django_encoder.default(o)
+
+
+def error_lists(errors):
+    """
+    Returns `errors`, an ErrorDict, as a dictionary of lists of messages.
+    Newer ErrorLists keep their messages outside of the list itself.
+    """
+    return dict((name, list(error_list)) for name, error_list in errors.items())
+
+
+def encode(o):
+    """
+    Returns the compact JSON encoding of `o` as a byte string, resolving
+    lazy objects and callables while encoding.
+    """
+    encoded = json.dumps(o, default=default, separators=(',', ':'), **DUMPS_OPTIONS)
+    if isinstance(encoded, unicode):
+        encoded = encoded.encode('utf-8')
+
+    return encoded
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import translation
+
+from django_remote_forms import logger
+from django_remote_forms.forms import RemoteForm
+from django_remote_forms.registry import form_registry
+from django_remote_forms.warmup import get_languages
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def write_if_changed(path, content):
+    """
+    Writes `content` to `path` unless the file already holds it. Returns
+    whether the file was written.
+    """
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+
+    # Write to a temporary file first so that a file being served is never
+    # seen half written
+    temporary_path = '%s.tmp' % path
+    with open(temporary_path, 'wb') as f:
+        f.write(content)
+    os.rename(temporary_path, path)
+    return True
+
+
+def export_schemas(directory, names=None, languages=None):
+    """
+    Serializes the registered forms, or those in `names`, in every language
+    of `languages` to minified JSON files in `directory`, named after the form,
+    the language and a hash of their content, e.g.
+    `ContactForm.en.0123456789ab.json`.
+
+    A `manifest.json` maps form names and languages to the file names. Files
+    that already exist with the same content are not written again.
+
+    Forms that fail to instantiate or serialize are logged and skipped.
+    Returns the names of the files written.
+    """
+    if names is None:
+        names = [name for name, entry in form_registry.items()]
+
+    if languages is None:
+        languages = get_languages()
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    manifest = {}
+    written = []
+    for name in names:
+        form_class, kwargs = form_registry.get(name)
+
+        for language in languages:
+            with translation.override(language):
+                try:
+                    form_dict = RemoteForm(form_class(), **kwargs).as_dict()
+                    content = json.dumps(form_dict, cls=DjangoJSONEncoder, separators=(',', ':'))
+                except Exception, e:
+                    logger.warning('Error exporting form %s in %s: %s', name, language, str(e))
+                    continue
+
+            filename = '%s.%s.%s.json' % (name, language, hashlib.md5(content).hexdigest()[:12])
+            manifest.setdefault(name, {})[language] = filename
+
+            if write_if_changed(os.path.join(directory, filename), content):
+                written.append(filename)
+
+    content = json.dumps(manifest, sort_keys=True, indent=2)
+    if write_if_changed(os.path.join(directory, MANIFEST_NAME), content):
+        written.append(MANIFEST_NAME)
+
+    return written
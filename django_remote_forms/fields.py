@@ -4,6 +4,7 @@ import datetime
 from django.conf import settings
 
 from django_remote_forms import logger
+from django_remote_forms.choices import choice_dicts, iter_choices, paginate_choices, static_choice_dicts
 
 class RemoteField(object):
     """
@@ -17,8 +18,15 @@ class RemoteField(object):
     https://docs.djangoproject.com/en/dev/ref/forms/api/#dynamic-initial-values
 
     `bound_field` is the BoundField returned from iterating over the form.
+
+    Serializers are created for every field on every serialization, so they
+    use slots rather than an instance dictionary. Subclasses should declare
+    `__slots__` as well, even if empty.
     """
 
+    __slots__ = ('widget', 'name', 'label', 'help_text', 'field', 'required', 'form_initial_data',
+            'dict_class')
+
     def __init__(self, bound_field, form_initial_data=None):
         self.widget = bound_field.field.widget
         self.name = bound_field.name
@@ -27,97 +35,142 @@ class RemoteField(object):
         self.field = bound_field.field
         self.required = bound_field.field.required
         self.form_initial_data = form_initial_data
+        self.dict_class = OrderedDict
+
+    def get_initial(self):
+        return self.form_initial_data or self.field.initial
+
+    def serialize_initial(self):
+        """
+        Returns the initial value as it appears in `as_dict`.
+        """
+        return self.get_initial()
 
     def as_dict(self):
-        field_dict = OrderedDict()
+        field_dict = self.dict_class()
         field_dict['title'] = self.name
         field_dict['required'] = self.field.required
         field_dict['label'] = self.label
-        field_dict['initial'] = self.form_initial_data or self.field.initial
+        field_dict['initial'] = self.get_initial()
         field_dict['help_text'] = self.help_text
 
-        field_dict['error_messages'] = self.field.error_messages
+        # Error messages are shared by every copy of the field, so they are
+        # copied before lazy messages get resolved in the active language
+        field_dict['error_messages'] = dict(self.field.error_messages)
         return field_dict
 
+    def dynamic_dict(self):
+        """
+        Returns the part of `as_dict` that may differ between two instances of
+        the same form class, without serializing the rest of the field. Cached
+        schemas store everything else.
+
+        The initial value as returned by `get_initial` is merged by the form
+        without creating serializers, so it only belongs here if the
+        serializer formats it.
+        """
+        return {}
+
 
 class RemoteCharField(RemoteField):
+    __slots__ = ()
+
     def as_dict(self):
         field_dict = super(RemoteCharField, self).as_dict()
 
-        field_dict.update({
-            'max_length': self.field.max_length,
-            'min_length': self.field.min_length
-        })
+        field_dict['max_length'] = self.field.max_length
+        field_dict['min_length'] = self.field.min_length
 
         return field_dict
 
 
 class RemoteIntegerField(RemoteField):
+    __slots__ = ()
+
     def as_dict(self):
         field_dict = super(RemoteIntegerField, self).as_dict()
 
-        field_dict.update({
-            'max_value': self.field.max_value,
-            'min_value': self.field.min_value
-        })
+        field_dict['max_value'] = self.field.max_value
+        field_dict['min_value'] = self.field.min_value
 
         return field_dict
 
 
 class RemoteFloatField(RemoteIntegerField):
-    def as_dict(self):
-        return super(RemoteFloatField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteDecimalField(RemoteIntegerField):
+    __slots__ = ()
+
     def as_dict(self):
         field_dict = super(RemoteDecimalField, self).as_dict()
 
-        field_dict.update({
-            'max_digits': self.field.max_digits,
-            'decimal_places': self.field.decimal_places
-        })
+        field_dict['max_digits'] = self.field.max_digits
+        field_dict['decimal_places'] = self.field.decimal_places
 
         return field_dict
 
 
 class RemoteTimeField(RemoteField):
-    def as_dict(self):
-        field_dict = super(RemoteTimeField, self).as_dict()
+    __slots__ = ()
 
-        field_dict['input_formats'] = self.field.input_formats
+    def get_formatted_initial(self):
+        """
+        Returns a tuple of input formats and initial value, converting the
+        initial value to a string if it is a date or time.
+        """
+        input_formats = self.field.input_formats
+        initial = self.get_initial()
 
-        if (field_dict['initial']):
-            if callable(field_dict['initial']):
-                field_dict['initial'] = field_dict['initial']()
+        if (initial):
+            if callable(initial):
+                initial = initial()
 
             # If initial value is datetime then convert it using first available input format
-            if (isinstance(field_dict['initial'], (datetime.datetime, datetime.time, datetime.date))):
-                if not len(field_dict['input_formats']):
-                    if isinstance(field_dict['initial'], datetime.date):
-                        field_dict['input_formats'] = settings.DATE_INPUT_FORMATS
-                    elif isinstance(field_dict['initial'], datetime.time):
-                        field_dict['input_formats'] = settings.TIME_INPUT_FORMATS
-                    elif isinstance(field_dict['initial'], datetime.datetime):
-                        field_dict['input_formats'] = settings.DATETIME_INPUT_FORMATS
-
-                input_format = field_dict['input_formats'][0]
-                field_dict['initial'] = field_dict['initial'].strftime(input_format)
+            if (isinstance(initial, (datetime.datetime, datetime.time, datetime.date))):
+                if not len(input_formats):
+                    if isinstance(initial, datetime.date):
+                        input_formats = settings.DATE_INPUT_FORMATS
+                    elif isinstance(initial, datetime.time):
+                        input_formats = settings.TIME_INPUT_FORMATS
+                    elif isinstance(initial, datetime.datetime):
+                        input_formats = settings.DATETIME_INPUT_FORMATS
+
+                input_format = input_formats[0]
+                initial = initial.strftime(input_format)
+
+        return input_formats, initial
+
+    def as_dict(self):
+        field_dict = super(RemoteTimeField, self).as_dict()
+
+        field_dict['input_formats'], field_dict['initial'] = self.get_formatted_initial()
 
         return field_dict
 
+    def serialize_initial(self):
+        return self.get_formatted_initial()[1]
+
+    def dynamic_dict(self):
+        dynamic_dict = super(RemoteTimeField, self).dynamic_dict()
+
+        dynamic_dict['input_formats'], dynamic_dict['initial'] = self.get_formatted_initial()
+
+        return dynamic_dict
+
 
 class RemoteDateField(RemoteTimeField):
-    def as_dict(self):
-        return super(RemoteDateField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteDateTimeField(RemoteTimeField):
-    def as_dict(self):
-        return super(RemoteDateTimeField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteRegexField(RemoteCharField):
+    __slots__ = ()
+
     def as_dict(self):
         field_dict = super(RemoteRegexField, self).as_dict()
 
@@ -128,13 +181,14 @@ class RemoteRegexField(RemoteCharField):
 
 
 class RemoteEmailField(RemoteCharField):
-    def as_dict(self):
-        return super(RemoteEmailField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteFileField(RemoteField):
+    __slots__ = ()
+
     def as_dict(self):
-        field_dict = super(RemoteField, self).as_dict()
+        field_dict = super(RemoteFileField, self).as_dict()
 
         field_dict['max_length'] = self.field.max_length
 
@@ -142,88 +196,146 @@ class RemoteFileField(RemoteField):
 
 
 class RemoteImageField(RemoteFileField):
-    def as_dict(self):
-        return super(RemoteImageField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteURLField(RemoteCharField):
-    def as_dict(self):
-        return super(RemoteURLField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteBooleanField(RemoteField):
-    def as_dict(self):
-        return super(RemoteBooleanField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteNullBooleanField(RemoteBooleanField):
-    def as_dict(self):
-        return super(RemoteNullBooleanField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteChoiceField(RemoteField):
+    __slots__ = ('label_field', 'choice_pagination', 'choice_cache', '_choices', '_next_cursor')
+
+    def __init__(self, *args, **kwargs):
+        super(RemoteChoiceField, self).__init__(*args, **kwargs)
+
+        # Model field used as choice label, see `choices.iter_choices`
+        self.label_field = None
+
+        # Options for serving the choices of a model backed field page by
+        # page, see `RemoteForm` config `paginated_choices`
+        self.choice_pagination = None
+
+        # ChoiceCache keeping the choices of a model backed field, see
+        # `RemoteForm` config `cached_choices`
+        self.choice_cache = None
+
+        self._choices = None
+        self._next_cursor = None
+
+    def is_paginated(self):
+        return bool(self.choice_pagination) and hasattr(self.field, 'queryset')
+
+    def get_choices(self):
+        # Choices are materialized only once per serializer, since the widget
+        # of the field usually serializes the same choices
+        if self._choices is None:
+            if self.is_paginated():
+                page = paginate_choices(self.field,
+                        page_size=self.choice_pagination.get('page_size', 50),
+                        label_field=self.label_field)
+                self._choices = page['choices']
+                self._next_cursor = page['next_cursor']
+            elif self.choice_cache and hasattr(self.field, 'queryset'):
+                self._choices = self.choice_cache.get_choices(self.field, self.label_field)
+            elif isinstance(self.field.choices, list):
+                self._choices = static_choice_dicts(self.field.choices)
+            else:
+                self._choices = choice_dicts(iter_choices(self.field, self.label_field))
+
+        return self._choices
+
+    def get_choice_source(self):
+        """
+        Describes where to fetch the choices that were not inlined by a
+        paginated field.
+        """
+        self.get_choices()
+
+        return {
+            'url': self.choice_pagination.get('url'),
+            'page_size': self.choice_pagination.get('page_size', 50),
+            'cursor': self._next_cursor,
+            'searchable': bool(self.choice_pagination.get('search_fields')),
+        }
+
     def as_dict(self):
         field_dict = super(RemoteChoiceField, self).as_dict()
 
-        field_dict['choices'] = []
-        for key, value in self.field.choices:
-            field_dict['choices'].append({
-                'value': key,
-                'display': value
-            })
+        field_dict['choices'] = self.get_choices()
+        if self.is_paginated():
+            field_dict['choice_source'] = self.get_choice_source()
 
         return field_dict
 
+    def dynamic_dict(self):
+        dynamic_dict = super(RemoteChoiceField, self).dynamic_dict()
+
+        dynamic_dict['choices'] = self.get_choices()
+        if self.is_paginated():
+            dynamic_dict['choice_source'] = self.get_choice_source()
+
+        return dynamic_dict
+
 
 class RemoteModelChoiceField(RemoteChoiceField):
-    def as_dict(self):
-        return super(RemoteModelChoiceField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteTypedChoiceField(RemoteChoiceField):
+    __slots__ = ()
+
     def as_dict(self):
         field_dict = super(RemoteTypedChoiceField, self).as_dict()
 
-        field_dict.update({
-            'coerce': self.coerce,
-            'empty_value': self.empty_value
-        })
+        field_dict['coerce'] = self.coerce
+        field_dict['empty_value'] = self.empty_value
 
         return field_dict
 
 
 class RemoteMultipleChoiceField(RemoteChoiceField):
-    def as_dict(self):
-        return super(RemoteMultipleChoiceField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteModelMultipleChoiceField(RemoteMultipleChoiceField):
-    def as_dict(self):
-        return super(RemoteModelMultipleChoiceField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteTypedMultipleChoiceField(RemoteMultipleChoiceField):
+    __slots__ = ()
+
     def as_dict(self):
         field_dict = super(RemoteTypedMultipleChoiceField, self).as_dict()
 
-        field_dict.update({
-            'coerce': self.coerce,
-            'empty_value': self.empty_value
-        })
+        field_dict['coerce'] = self.coerce
+        field_dict['empty_value'] = self.empty_value
 
         return field_dict
 
 
 class RemoteComboField(RemoteField):
+    __slots__ = ()
+
     def as_dict(self):
         field_dict = super(RemoteComboField, self).as_dict()
 
-        field_dict.update(fields=self.field.fields)
+        field_dict['fields'] = self.field.fields
 
         return field_dict
 
 
 class RemoteMultiValueField(RemoteField):
+    __slots__ = ()
+
     def as_dict(self):
         field_dict = super(RemoteMultiValueField, self).as_dict()
 
@@ -233,35 +345,33 @@ class RemoteMultiValueField(RemoteField):
 
 
 class RemoteFilePathField(RemoteChoiceField):
+    __slots__ = ()
+
     def as_dict(self):
         field_dict = super(RemoteFilePathField, self).as_dict()
 
-        field_dict.update({
-            'path': self.field.path,
-            'match': self.field.match,
-            'recursive': self.field.recursive
-        })
+        field_dict['path'] = self.field.path
+        field_dict['match'] = self.field.match
+        field_dict['recursive'] = self.field.recursive
 
         return field_dict
 
 
 class RemoteSplitDateTimeField(RemoteMultiValueField):
+    __slots__ = ()
+
     def as_dict(self):
         field_dict = super(RemoteSplitDateTimeField, self).as_dict()
 
-        field_dict.update({
-            'input_date_formats': self.field.input_date_formats,
-            'input_time_formats': self.field.input_time_formats
-        })
+        field_dict['input_date_formats'] = self.field.input_date_formats
+        field_dict['input_time_formats'] = self.field.input_time_formats
 
         return field_dict
 
 
 class RemoteIPAddressField(RemoteCharField):
-    def as_dict(self):
-        return super(RemoteIPAddressField, self).as_dict()
+    __slots__ = ()
 
 
 class RemoteSlugField(RemoteCharField):
-    def as_dict(self):
-        return super(RemoteSlugField, self).as_dict()
+    __slots__ = ()
@@ -1,65 +1,145 @@
 from collections import OrderedDict
+import copy
 
-from django_remote_forms import fields, logger, widgets
-from django_remote_forms.utils import resolve_promise
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import translation
+
+from django_remote_forms import fields, instrumentation, logger, widgets
+from django_remote_forms.cache import plan_cache, schema_cache, shared_schema_cache
+from django_remote_forms.choices import ChoiceCache, ChoiceTables, shares_choices
+from django_remote_forms.compact import compact
+from django_remote_forms.encoding import encode, error_lists
+from django_remote_forms.instrumentation import FieldRecord, measure
+from django_remote_forms.plans import FormPlan, PlanStep
+from django_remote_forms.registry import field_registry, widget_registry
+from django_remote_forms.utils import SCALAR_TYPES, ResolvedList, fingerprint, freeze, resolve_promise
+
+# Top level keys of `RemoteForm.as_dict`
+SECTIONS = ('title', 'non_field_errors', 'label_suffix', 'is_bound', 'prefix', 'fields', 'errors',
+        'fieldsets', 'data', 'choice_tables')
 
 class RemoteForm(object):
     def __init__(self, form, *args, **kwargs):
         self.form = form
         self._config = kwargs.pop('config', {})
+        self.cache_schema = kwargs.pop('cache_schema', False)
+
+        # Emit every distinct choice list once in a top level `choice_tables`
+        # section, which fields and widgets reference by id
+        self.choice_tables = kwargs.pop('choice_tables', False)
+
+        # Output dictionaries are ordered by default; plain dictionaries are
+        # lighter but unordered before Python 3.7, so the `fields` dictionary
+        # is ordered whatever the class
+        self.dict_class = kwargs.pop('dict_class', OrderedDict)
+
+        # Per-instance dictionaries of dynamic fields computed for the
+        # fingerprint or while building the schema, by field name, which the
+        # next serialization uses rather than fetching choices again
+        self._dynamic_dicts = {}
+
+        # Fold config overrides into the serializer lookups once
+        self._field_serializers = field_registry.bind(self._config.get('fields'))
+        self._widget_serializers = widget_registry.bind(self._config.get('widgets'))
 
-        self.all_fields = set(self.form.fields.keys())
+        exclude = kwargs.pop('exclude', [])
+        include = kwargs.pop('include', [])
+        readonly = kwargs.pop('readonly', [])
+        ordering = kwargs.pop('ordering', [])
 
-        self.excluded_fields = set(kwargs.pop('exclude', []))
-        self.included_fields = set(kwargs.pop('include', []))
-        self.readonly_fields = set(kwargs.pop('readonly', []))
-        self.ordered_fields = kwargs.pop('ordering', [])
+        # Validating the field lists and resolving serializers only happens
+        # the first time a form class is serialized with these arguments
+        plan_key = (self.form.__class__, tuple(self.form.fields), freeze(self._config),
+                freeze(exclude), freeze(include), freeze(readonly), freeze(ordering))
+        self.plan = plan_cache.get(plan_key)
+        if self.plan is None:
+            self.plan = self.compile_plan(exclude, include, readonly, ordering)
+            plan_cache.set(plan_key, self.plan)
 
-        self.fieldsets = []
-        if(hasattr(self.form, 'Meta')):
-            self.fieldsets = getattr(self.form.Meta, 'fieldsets', [])
+        self.all_fields = self.plan.all_fields
+        self.excluded_fields = self.plan.excluded_fields
+        self.included_fields = self.plan.included_fields
+        self.readonly_fields = self.plan.readonly_fields
+        self.ordered_fields = self.plan.ordered_fields
+        self.fields = self.plan.fields
+
+    def compile_plan(self, exclude, include, readonly, ordering):
+        """
+        Validates the passed field lists and returns the FormPlan with the
+        steps to serialize every field.
+        """
+        all_fields = frozenset(self.form.fields.keys())
+
+        excluded_fields = set(exclude)
+        included_fields = set(include)
+        readonly_fields = set(readonly)
+        ordered_fields = ordering
 
         # Make sure all passed field lists are valid
-        if self.excluded_fields and not (self.all_fields >= self.excluded_fields):
-            logger.warning('Excluded fields %s are not present in form fields' % (self.excluded_fields - self.all_fields))
-            self.excluded_fields = set()
+        if excluded_fields and not (all_fields >= excluded_fields):
+            logger.warning('Excluded fields %s are not present in form fields' % (excluded_fields - all_fields))
+            excluded_fields = set()
 
-        if self.included_fields and not (self.all_fields >= self.included_fields):
-            logger.warning('Included fields %s are not present in form fields' % (self.included_fields - self.all_fields))
-            self.included_fields = set()
+        if included_fields and not (all_fields >= included_fields):
+            logger.warning('Included fields %s are not present in form fields' % (included_fields - all_fields))
+            included_fields = set()
 
-        if self.readonly_fields and not (self.all_fields >= self.readonly_fields):
-            logger.warning('Readonly fields %s are not present in form fields' % (self.readonly_fields - self.all_fields))
-            self.readonly_fields = set()
+        if readonly_fields and not (all_fields >= readonly_fields):
+            logger.warning('Readonly fields %s are not present in form fields' % (readonly_fields - all_fields))
+            readonly_fields = set()
 
-        if self.ordered_fields and not (self.all_fields >= set(self.ordered_fields)):
-            logger.warning('Readonly fields %s are not present in form fields' % (set(self.ordered_fields) - self.all_fields))
-            self.ordered_fields = []
+        if ordered_fields and not (all_fields >= set(ordered_fields)):
+            logger.warning('Readonly fields %s are not present in form fields' % (set(ordered_fields) - all_fields))
+            ordered_fields = []
 
-        if self.included_fields | self.excluded_fields:
-            logger.warning('Included and excluded fields have following fields %s in common' % (set(self.ordered_fields) - self.all_fields))
-            self.excluded_fields = set()
-            self.included_fields = set()
+        if included_fields & excluded_fields:
+            logger.warning('Included and excluded fields have following fields %s in common' % (included_fields & excluded_fields))
+            excluded_fields = set()
+            included_fields = set()
 
         # Extend exclude list from include list
-        self.excluded_fields |= (self.included_fields - self.all_fields)
+        if included_fields:
+            excluded_fields |= (all_fields - included_fields)
 
-        if not self.ordered_fields:
+        if not ordered_fields:
             try:
-                self.ordered_fields = self.form.fields.keyOrder
+                ordered_fields = self.form.fields.keyOrder
             except AttributeError:
-                self.ordered_fields = self.form.fields.keys()
+                ordered_fields = self.form.fields.keys()
+
+        choice_labels = self._config.get('choice_labels', {})
+        paginated_choices = self._config.get('paginated_choices', {})
 
-        self.fields = []
+        steps = []
 
         # Construct ordered field list considering exclusions
-        for field_name in self.ordered_fields:
-            if field_name in self.excluded_fields:
+        for field_name in ordered_fields:
+            if field_name in excluded_fields:
                 continue
 
-            self.fields.append(field_name)
+            field = self.form.fields[field_name]
+            steps.append(PlanStep(
+                name=field_name,
+                field_class=field.__class__,
+                widget_class=field.widget.__class__,
+                remote_field_class=self._field_serializers.resolve(field.__class__),
+                remote_widget_class=self._widget_serializers.resolve(field.widget.__class__),
+                readonly=field_name in readonly_fields,
+                label_field=choice_labels.get(field_name),
+                choice_pagination=paginated_choices.get(field_name),
+                choice_cache=self.get_choice_cache(field_name),
+            ))
 
-    def as_dict(self):
+        fieldsets = []
+        if hasattr(self.form, 'Meta'):
+            fieldsets = getattr(self.form.Meta, 'fieldsets', [])
+
+        return FormPlan(all_fields, frozenset(excluded_fields), frozenset(included_fields),
+                frozenset(readonly_fields), tuple(ordered_fields), tuple(steps), fieldsets)
+
+    def as_dict(self, sections=None, field_attrs=None):
         """
         Returns a form as a dictionary that looks like the following:
 
@@ -85,83 +165,639 @@ class RemoteForm(object):
                 }
             }
         }
+
+        Only the top level keys listed in `sections` are serialized, e.g.
+        `sections=('errors', 'data')` skips serializing fields and widgets
+        altogether. Likewise only the keys listed in `field_attrs` are kept in
+        every field dictionary.
+
+        With `choice_tables`, the `choices` of fields and widgets are ids of
+        the choice lists in the top level `choice_tables` dictionary.
         """
-        form_dict = OrderedDict()
-        form_dict['title'] = self.form.__class__.__name__
-        form_dict['non_field_errors'] = self.form.non_field_errors()
-        form_dict['label_suffix'] = self.form.label_suffix
-        form_dict['is_bound'] = self.form.is_bound
-        form_dict['prefix'] = self.form.prefix
-        form_dict['fields'] = OrderedDict()
-        form_dict['errors'] = self.form.errors
-        fieldset_list = []
-        for fieldset_name, fieldset_data in self.fieldsets:
-            fieldset_data.update({
-                'key': fieldset_name,
-            })
-            fieldset_list.append(fieldset_data)
-        form_dict['fieldsets'] = fieldset_list
+        return self.build_dict(sections, field_attrs)
 
-        initial_data = {}
+    def as_json_bytes(self, sections=None, field_attrs=None):
+        """
+        Returns the compact JSON encoding of `as_dict` as a byte string.
+
+        Lazy strings, callables, model instances, dates and decimals are
+        encoded as they are met, so the dictionary is never walked to resolve
+        them beforehand.
+        """
+        return encode(self.build_dict(sections, field_attrs, resolve=False))
+
+    def as_compact_dict(self, sections=None):
+        """
+        Returns `as_dict` in the compact wire format, with short keys and
+        without the default values of fields and widgets. See
+        `django_remote_forms.compact.expand` for decoding it.
+        """
+        return compact(self.as_dict(sections))
 
-        for bound_field in (x for x in self.form if x.name in self.fields):
-            # Retrieve the initial data from the form itself if it exists so
-            # that we properly handle which initial data should be returned in
-            # the dictionary.
-
-            # Please refer to the Django Form API documentation for details on
-            # why this is necessary:
-            # https://docs.djangoproject.com/en/dev/ref/forms/api/#dynamic-initial-values
-            form_initial_field_data = self.form.initial.get(bound_field.name)
-
-            # Instantiate the Remote Forms equivalent of the field if possible
-            # in order to retrieve the field contents as a dictionary.
-            # Use config to to check for any serializer overrides.
-            field_class_name = bound_field.field.__class__.__name__
-            if self._config.get('fields', {}).get(field_class_name):
-                remote_field_class = self._config['fields'][field_class_name]
+    def build_dict(self, sections=None, field_attrs=None, resolve=True):
+        """
+        Builds `as_dict`, leaving lazy objects and callables in place unless
+        `resolve` is given.
+        """
+        if sections is None:
+            sections = SECTIONS
+
+        schema = None
+        if self.cache_schema and ('fields' in sections or 'fieldsets' in sections):
+            schema = self.get_schema()
+
+        form_dict = self.form_header_dict(sections, resolve)
+
+        if 'fieldsets' in sections:
+            if schema:
+                form_dict['fieldsets'] = schema['fieldsets']
+            elif resolve:
+                form_dict['fieldsets'] = resolve_promise(self.fieldset_list())
             else:
-                remote_field_class = getattr(fields, 'Remote%s' % field_class_name)
+                form_dict['fieldsets'] = self.fieldset_list()
 
-            try:
-                remote_field = remote_field_class(bound_field, form_initial_field_data)
-            except Exception, e:
-                logger.warning('Error serializing field %s: %s', remote_field_class, str(e))
-                field_dict = {}
+        initial_data = {}
+        choice_tables = ChoiceTables() if self.choice_tables else None
+
+        if 'fields' in sections:
+            for name, field_dict, initial in self.iter_field_dicts(schema, field_attrs, choice_tables, resolve):
+                form_dict['fields'][name] = field_dict
+                initial_data[name] = initial
+        elif 'data' in sections and not self.form.data:
+            initial_data = self.initial_data(resolve)
+
+        if 'data' in sections:
+            if self.form.data:
+                form_dict['data'] = resolve_promise(self.form.data) if resolve else self.form.data
             else:
-                field_dict = remote_field.as_dict()
+                form_dict['data'] = initial_data
 
-            if bound_field.name in self.readonly_fields:
-                field_dict['readonly'] = True
+        if 'choice_tables' in form_dict:
+            form_dict['choice_tables'] = choice_tables.tables
 
-            form_dict['fields'][bound_field.name] = field_dict
+        return form_dict
 
-            widget_class_name = bound_field.field.widget.__class__.__name__
-            if self._config.get('widgets', {}).get(widget_class_name):
-                remote_widget_class = self._config['widgets'][widget_class_name]
+    def form_header_dict(self, sections=SECTIONS, resolve=True):
+        """
+        Returns the top level of `as_dict` for `sections`, with empty
+        placeholders for fields, fieldsets and data. Errors are left
+        unresolved unless `resolve` is given.
+        """
+        form_dict = self.dict_class()
+        if 'title' in sections:
+            form_dict['title'] = self.form.__class__.__name__
+        if 'non_field_errors' in sections:
+            if resolve:
+                form_dict['non_field_errors'] = resolve_promise(self.form.non_field_errors())
+            else:
+                form_dict['non_field_errors'] = list(self.form.non_field_errors())
+        if 'label_suffix' in sections:
+            form_dict['label_suffix'] = self.form.label_suffix
+        if 'is_bound' in sections:
+            form_dict['is_bound'] = self.form.is_bound
+        if 'prefix' in sections:
+            form_dict['prefix'] = self.form.prefix
+        if 'fields' in sections:
+            # Field order is part of the form definition
+            form_dict['fields'] = OrderedDict()
+        if 'errors' in sections:
+            if resolve:
+                form_dict['errors'] = resolve_promise(self.form.errors)
             else:
-                remote_widget_class = getattr(widgets, 'Remote%s' % widget_class_name)
+                form_dict['errors'] = error_lists(self.form.errors)
+        if 'fieldsets' in sections:
+            form_dict['fieldsets'] = None
+        if 'data' in sections:
+            form_dict['data'] = None
+        if 'choice_tables' in sections and self.choice_tables:
+            form_dict['choice_tables'] = None
+        return form_dict
 
-            try:
-                remote_widget = remote_widget_class(remote_field.widget,
-                        name=remote_field.name, required=remote_field.required)
-            except Exception, e:
-                logger.error('Error serializing %s: %s', remote_widget_class, str(e))
-                widget_dict = {}
+    def fieldset_list(self):
+        return self.plan.fieldsets.as_list()
+
+    def get_choice_cache(self, field_name):
+        """
+        Returns the ChoiceCache for the field from the `cached_choices` config,
+        which maps field names to ChoiceCache keyword arguments, or None.
+        """
+        options = self._config.get('cached_choices', {}).get(field_name)
+        if options is None:
+            return None
+
+        return ChoiceCache(**options)
+
+    def get_serializers(self, bound_field, step=None):
+        """
+        Returns the Remote Forms equivalents of the field and widget of
+        `bound_field`, either of which is None if it could not be created.
+        The serializer classes and options are taken from the plan `step` of
+        the field where possible.
+        """
+        if step is None:
+            step = self.plan.step_map.get(bound_field.name)
+
+        # Retrieve the initial data from the form itself if it exists so
+        # that we properly handle which initial data should be returned in
+        # the dictionary.
+
+        # Please refer to the Django Form API documentation for details on
+        # why this is necessary:
+        # https://docs.djangoproject.com/en/dev/ref/forms/api/#dynamic-initial-values
+        form_initial_field_data = self.form.initial.get(bound_field.name)
+
+        # Instantiate the Remote Forms equivalent of the field if possible
+        # in order to retrieve the field contents as a dictionary.
+        # Config overrides and custom subclasses are handled by the registry,
+        # which only has to be asked if the form replaced the planned field.
+        if step and bound_field.field.__class__ is step.field_class:
+            remote_field_class = step.remote_field_class
+        else:
+            remote_field_class = self._field_serializers.resolve(bound_field.field.__class__)
+
+        try:
+            remote_field = remote_field_class(bound_field, form_initial_field_data)
+        except Exception, e:
+            logger.warning('Error serializing field %s: %s', remote_field_class, str(e))
+            remote_field = None
+
+        if step and bound_field.field.widget.__class__ is step.widget_class:
+            remote_widget_class = step.remote_widget_class
+        else:
+            remote_widget_class = self._widget_serializers.resolve(bound_field.field.widget.__class__)
+
+        try:
+            remote_widget = remote_widget_class(bound_field.field.widget,
+                    name=bound_field.name, required=bound_field.field.required)
+        except Exception, e:
+            logger.error('Error serializing %s: %s', remote_widget_class, str(e))
+            remote_widget = None
+
+        if remote_field:
+            remote_field.dict_class = self.dict_class
+        if remote_widget:
+            remote_widget.dict_class = self.dict_class
+
+        if isinstance(remote_field, fields.RemoteChoiceField):
+            if step:
+                remote_field.label_field = step.label_field
+                remote_field.choice_pagination = step.choice_pagination
+                remote_field.choice_cache = step.choice_cache
             else:
-                widget_dict = remote_widget.as_dict()
+                remote_field.label_field = self._config.get('choice_labels', {}).get(bound_field.name)
+                remote_field.choice_pagination = self._config.get('paginated_choices', {}).get(bound_field.name)
+                remote_field.choice_cache = self.get_choice_cache(bound_field.name)
+
+            if (isinstance(remote_widget, widgets.RemoteSelect) and
+                    shares_choices(bound_field.field, bound_field.field.widget)):
+                remote_widget.choices_from = remote_field
 
-            form_dict['fields'][bound_field.name]['widget'] = widget_dict
+        return remote_field, remote_widget
+
+    def field_dicts(self, field_attrs=None, records=None):
+        """
+        Yields a tuple of field name and fully serialized field, including its
+        widget, for every field in the form that should be serialized.
+
+        The widget is not serialized if `field_attrs` is given and does not
+        include it. If `records` is given, the serialization of every field is
+        measured in a FieldRecord stored in it by field name.
+        """
+        serialize_widget = field_attrs is None or 'widget' in field_attrs
+
+        for step in self.plan.steps:
+            bound_field = self.form[step.name]
+            remote_field, remote_widget = self.get_serializers(bound_field, step)
+
+            record = None
+            if records is not None:
+                record = records[bound_field.name] = FieldRecord(self.form, bound_field.name,
+                        remote_field, remote_widget)
+
+            field_dict = measure(record, 'field', remote_field.as_dict) if remote_field else {}
+
+            if step.readonly:
+                field_dict['readonly'] = True
+
+            if serialize_widget:
+                field_dict['widget'] = measure(record, 'widget', remote_widget.as_dict) if remote_widget else {}
 
             # Load the initial data, which is a conglomerate of form initial and field initial
-            if 'initial' not in form_dict['fields'][bound_field.name]:
-                form_dict['fields'][bound_field.name]['initial'] = None
+            if 'initial' not in field_dict:
+                field_dict['initial'] = None
+
+            yield bound_field.name, field_dict
+
+    def get_schema_key(self):
+        # Plans are cached per form class, field set, config and field lists,
+        # so the plan itself identifies everything the schema depends on
+        return (
+            self.form.__class__,
+            self.plan,
+            self.dict_class,
+            translation.get_language(),
+        )
+
+    def get_schema(self):
+        """
+        Returns the static part of the serialized form from the schema cache,
+        or else from the shared schema cache, building and caching it first if
+        necessary.
+        """
+        key = self.get_schema_key()
+        schema = schema_cache.get(key)
+        if schema is None:
+            shared_key = self.get_shared_schema_key()
+            schema = shared_schema_cache.get(shared_key)
+            if schema is None:
+                schema = self.build_schema()
+                shared_schema_cache.set(shared_key, schema)
+            schema_cache.set(key, schema)
+
+        return schema
+
+    def get_shared_schema_key(self):
+        """
+        Returns the key of the schema in the shared schema cache, made of the
+        same parts as `get_schema_key` in a form that is stable between
+        processes.
+        """
+        return shared_schema_cache.make_key(
+            translation.get_language(),
+            '%s.%s' % (self.form.__class__.__module__, self.form.__class__.__name__),
+            self._config,
+            self.plan.fields,
+            sorted(self.plan.readonly_fields),
+            self.dict_class,
+        )
+
+    def build_schema(self):
+        """
+        Serializes the parts of the form that are shared by every instance of
+        the form class: fields and widgets without their dynamic dictionaries,
+        plus fieldsets. Dynamic keys are kept as None placeholders so that merged
+        dictionaries retain the usual key order.
+        """
+        schema = {
+            'fieldsets': resolve_promise(self.fieldset_list()),
+            'fields': OrderedDict(),
+        }
+        dynamic_fields = []
+
+        for step in self.plan.steps:
+            bound_field = self.form[step.name]
+            remote_field, remote_widget = self.get_serializers(bound_field, step)
+
+            field_dict = remote_field.as_dict() if remote_field else {}
+            widget_dict = remote_widget.as_dict() if remote_widget else {}
+
+            if step.readonly:
+                field_dict['readonly'] = True
+
+            field_dict['widget'] = widget_dict
+            field_dict['initial'] = None
+
+            # Choices are commonly narrowed per instance, e.g. by assigning a
+            # filtered queryset in the form's __init__, so they are part of the
+            # dynamic dictionaries
+            dynamic_dict = remote_field.dynamic_dict() if remote_field else {}
+            for key in dynamic_dict:
+                field_dict[key] = None
+
+            widget_dynamic_dict = remote_widget.dynamic_dict() if remote_widget else {}
+            for key in widget_dynamic_dict:
+                widget_dict[key] = None
+
+            # Serializers hand out state of the form instance, e.g. the attrs
+            # of its widgets, which must not leak into the shared schema
+            schema['fields'][bound_field.name] = resolve_promise(copy.deepcopy(field_dict))
+
+            if dynamic_dict or widget_dynamic_dict:
+                dynamic_fields.append(bound_field.name)
+                self._dynamic_dicts[bound_field.name] = (
+                    dynamic_dict if remote_field else None,
+                    widget_dynamic_dict if remote_widget else None,
+                )
 
-            initial_data[bound_field.name] = form_dict['fields'][bound_field.name]['initial']
+        schema['dynamic_fields'] = frozenset(dynamic_fields)
 
-        if self.form.data:
-            form_dict['data'] = self.form.data
+        # Field order is hashed separately since the hash sorts keys
+        schema['fingerprint'] = fingerprint(self.form.__class__.__name__, list(schema['fields']),
+                schema['fields'], schema['fieldsets'], translation.get_language())
+
+        return schema
+
+    def get_initial(self, name):
+        """
+        Returns the initial value of the field `name` as its serializer's
+        `get_initial` would, without creating the serializer.
+        """
+        initial = self.form.initial.get(name)
+        return initial or self.form.fields[name].initial
+
+    def get_fingerprint(self, form_dict=None):
+        """
+        Returns a hash of the form definition, covering fields, widgets,
+        choices, initial values, fieldsets, field order and language.
+
+        With `cache_schema`, the static parts are hashed once per schema and
+        only the per-instance parts of the fields are serialized, which the
+        next serialization of the form reuses, so choices are fetched once
+        for both. Otherwise the hash is that of the serialized form,
+        `form_dict` if given, so that serializing the form once serves both.
+        """
+        if not self.cache_schema:
+            if form_dict is None:
+                form_dict = self.as_dict()
+            return fingerprint(form_dict)
+
+        schema = self.get_schema()
+        dynamic_fields = schema['dynamic_fields']
+
+        dynamic_parts = []
+        for name in schema['fields']:
+            if name not in dynamic_fields:
+                dynamic_parts.append([name, self.get_initial(name)])
+                continue
+
+            dynamic_dicts = self._dynamic_dicts.get(name)
+            if dynamic_dicts is None:
+                dynamic_dicts = self._dynamic_dicts[name] = self.get_dynamic_dicts(name)
+
+            dynamic_parts.append([name, self.get_initial(name)] + list(dynamic_dicts))
+
+        return fingerprint(schema['fingerprint'], self.form.label_suffix, self.form.prefix,
+                resolve_promise(dynamic_parts))
+
+    def get_dynamic_dicts(self, name, records=None, serialize_widget=True):
+        """
+        Returns the `dynamic_dict` of the serializers of the field `name` and
+        of its widget, either of which is None if it could not be created or,
+        for the widget, if not `serialize_widget`. The serialization is
+        measured in `records` if given, see `field_dicts`.
+        """
+        remote_field, remote_widget = self.get_serializers(self.form[name])
+
+        record = None
+        if records is not None:
+            record = records[name] = FieldRecord(self.form, name, remote_field, remote_widget)
+
+        field_dynamic_dict = None
+        if remote_field:
+            field_dynamic_dict = measure(record, 'field', remote_field.dynamic_dict)
+
+        widget_dynamic_dict = None
+        if remote_widget and serialize_widget:
+            widget_dynamic_dict = measure(record, 'widget', remote_widget.dynamic_dict)
+
+        return field_dynamic_dict, widget_dynamic_dict
+
+    def schema_field_dicts(self, schema, field_attrs=None, records=None, resolve=True):
+        """
+        Same as `field_dicts`, but merges the per-instance parts of every
+        field into copies of the fields in the cached static `schema`. Unless
+        `resolve` is False, the merged parts are resolved, so that the
+        returned dictionaries hold no promises.
+        """
+        dynamic_fields = schema['dynamic_fields']
+        serialize_widget = field_attrs is None or 'widget' in field_attrs
+
+        for name, static_dict in schema['fields'].items():
+            field_dict = self.dict_class(static_dict)
+
+            initial = self.get_initial(name)
+            if resolve and not isinstance(initial, SCALAR_TYPES):
+                initial = resolve_promise(initial)
+            field_dict['initial'] = initial
+
+            if name in dynamic_fields:
+                dynamic_dicts = self._dynamic_dicts.pop(name, None)
+                if dynamic_dicts is None:
+                    dynamic_dicts = self.get_dynamic_dicts(name, records, serialize_widget)
+                field_dynamic_dict, widget_dynamic_dict = dynamic_dicts
+
+                if field_dynamic_dict is not None:
+                    field_dict.update(resolve_promise(field_dynamic_dict) if resolve else field_dynamic_dict)
+
+                if widget_dynamic_dict is not None and serialize_widget:
+                    widget_dict = self.dict_class(static_dict['widget'])
+                    widget_dict.update(resolve_promise(widget_dynamic_dict) if resolve else widget_dynamic_dict)
+                    field_dict['widget'] = widget_dict
+
+            yield name, field_dict
+
+    def iter_field_dicts(self, schema=None, field_attrs=None, choice_tables=None, resolve=True):
+        """
+        Yields a tuple of field name, serialized field and initial value with
+        resolved promises, unless `resolve` is False, built from `schema` if
+        given. Only `field_attrs` are kept in the field dictionary if given.
+        Choice lists are replaced by their id in `choice_tables` if given.
+
+        Fields are measured and reported through the `field_serialized`
+        signal while it has receivers.
+        """
+        if not instrumentation.is_enabled():
+            for item in self._iter_field_dicts(schema, field_attrs, choice_tables, resolve):
+                yield item
+            return
+
+        records = {}
+        with instrumentation.capture_queries():
+            for name, field_dict, initial in self._iter_field_dicts(schema, field_attrs, choice_tables, resolve,
+                    records):
+                if name in records:
+                    records[name].send(field_dict)
+                yield name, field_dict, initial
+
+    def _iter_field_dicts(self, schema=None, field_attrs=None, choice_tables=None, resolve=True, records=None):
+        if schema:
+            field_dicts = self.schema_field_dicts(schema, field_attrs, records, resolve)
+
+            # Schemas are resolved when built and the merged parts by
+            # schema_field_dicts, so the dictionaries are not walked again
+            resolve = False
         else:
-            form_dict['data'] = initial_data
+            field_dicts = self.field_dicts(field_attrs, records)
+
+        for name, field_dict in field_dicts:
+            if choice_tables is not None:
+                # Field dictionaries are built or copied for every form, but
+                # widget dictionaries of static fields belong to the schema
+                shared_widget_dict = schema['fields'][name]['widget'] if schema else None
+                field_dict = self.reference_choices(field_dict, choice_tables, shared_widget_dict)
+
+            if field_attrs is None:
+                if resolve:
+                    field_dict = resolve_promise(field_dict)
+                yield name, field_dict, field_dict['initial']
+                continue
+
+            initial = field_dict['initial']
+            field_dict = self.dict_class((k, v) for k, v in field_dict.items() if k in field_attrs)
+            if resolve:
+                yield name, resolve_promise(field_dict), resolve_promise(initial)
+            else:
+                yield name, field_dict, initial
+
+    def reference_choices(self, field_dict, choice_tables, shared_widget_dict=None):
+        """
+        Returns `field_dict` with the choices of the field and its widget
+        replaced by their id in `choice_tables`. The widget dictionary is
+        copied rather than changed if it is `shared_widget_dict`, the widget
+        dictionary of a cached schema.
+        """
+        field_choices = field_dict.get('choices')
+        widget_dict = field_dict.get('widget')
+        widget_choices = widget_dict.get('choices') if widget_dict else None
+
+        # Only lists serialized as a whole are tables: choices, and the
+        # shared selects of date widgets
+        if isinstance(field_choices, ResolvedList):
+            field_dict['choices'] = choice_tables.reference(field_choices)
+
+        if isinstance(widget_choices, ResolvedList):
+            if widget_dict is shared_widget_dict:
+                widget_dict = field_dict['widget'] = self.dict_class(widget_dict)
+            widget_dict['choices'] = choice_tables.reference(widget_choices)
+
+        return field_dict
+
+    def get_validated_fields(self, names):
+        """
+        Returns the serialized fields among `names`, along with the fields
+        depending on them according to the `dependent_fields` config, in form
+        order.
+        """
+        dependent_fields = self._config.get('dependent_fields', {})
+
+        names = set(names)
+        for name in list(names):
+            names.update(dependent_fields.get(name, ()))
+
+        return [x for x in self.plan.fields if x in names]
+
+    def validate_fields(self, names, data=None, files=None):
+        """
+        Cleans only the fields in `names` and the fields depending on them
+        with `data` and `files`, which default to those of the form, and
+        returns the errors of those fields in the shape of `errors` in
+        `as_dict`. Other fields, and the form's `clean`, are not run.
+
+        Besides the field's own `clean`, the form's `clean_<name>` method is
+        called, which sees the values of the validated fields cleaned before
+        it in `cleaned_data`. The form's own `cleaned_data` is restored
+        afterwards, so a form that was already validated keeps it. Fields
+        declared in the `dependent_fields` config, which maps field names to
+        the names of the fields depending on them, are validated along with
+        them, e.g. a password confirmation along with the password.
+        """
+        if data is None:
+            data = self.form.data
+        if files is None:
+            files = self.form.files
+
+        errors = self.dict_class()
+
+        # Only the validated fields are cleaned, so the form's `clean_<name>`
+        # methods see a partial cleaned_data, which is replaced by whatever
+        # the form held before once done
+        missing = object()
+        previous_cleaned_data = getattr(self.form, 'cleaned_data', missing)
+        cleaned_data = self.form.cleaned_data = {}
+
+        try:
+            for name in self.get_validated_fields(names):
+                field = self.form.fields[name]
+                value = field.widget.value_from_datadict(data, files, self.form.add_prefix(name))
+                try:
+                    if isinstance(field, forms.FileField):
+                        initial = self.form.initial.get(name, field.initial)
+                        value = field.clean(value, initial)
+                    else:
+                        value = field.clean(value)
+                    cleaned_data[name] = value
+
+                    if hasattr(self.form, 'clean_%s' % name):
+                        cleaned_data[name] = getattr(self.form, 'clean_%s' % name)()
+                except ValidationError, e:
+                    errors[name] = list(e.messages)
+                    cleaned_data.pop(name, None)
+        finally:
+            if previous_cleaned_data is missing:
+                del self.form.cleaned_data
+            else:
+                self.form.cleaned_data = previous_cleaned_data
+
+        return resolve_promise(errors)
+
+    def initial_data(self, resolve=True):
+        """
+        Returns the initial value of every serialized field without
+        serializing the fields.
+        """
+        initial_data = {}
+        for step in self.plan.steps:
+            bound_field = self.form[step.name]
+            remote_field, remote_widget = self.get_serializers(bound_field, step)
+            if remote_field:
+                initial_data[bound_field.name] = remote_field.serialize_initial()
+            else:
+                initial_data[bound_field.name] = None
+
+        return resolve_promise(initial_data) if resolve else initial_data
+
+    def iter_json(self, cls=DjangoJSONEncoder, sections=None, field_attrs=None):
+        """
+        Yields the JSON encoding of `as_dict` in chunks, serializing,
+        resolving and encoding one field at a time so that the complete
+        dictionary never has to be held in memory. Every field is encoded in
+        one chunk, as are the other top level values. The result can be
+        passed to a StreamingHttpResponse as is.
+        """
+        if sections is None:
+            sections = SECTIONS
+
+        encoder = cls()
+
+        schema = None
+        if self.cache_schema and ('fields' in sections or 'fieldsets' in sections):
+            schema = self.get_schema()
+
+        form_dict = self.form_header_dict(sections)
+
+        if 'fieldsets' in sections:
+            form_dict['fieldsets'] = schema['fieldsets'] if schema else resolve_promise(self.fieldset_list())
+
+        initial_data = {}
+        choice_tables = ChoiceTables() if self.choice_tables else None
+
+        separator = '{'
+        for key, value in form_dict.items():
+            yield separator + encoder.encode(key) + ': '
+            separator = ', '
+
+            if key == 'fields':
+                field_separator = '{'
+                for name, field_dict, initial in self.iter_field_dicts(schema, field_attrs, choice_tables):
+                    initial_data[name] = initial
+
+                    yield field_separator + encoder.encode(name) + ': ' + encoder.encode(field_dict)
+                    field_separator = ', '
+
+                yield '{}' if field_separator == '{' else '}'
+                continue
+
+            if key == 'data':
+                if self.form.data:
+                    value = resolve_promise(self.form.data)
+                elif 'fields' in sections:
+                    value = initial_data
+                else:
+                    value = self.initial_data()
+
+            if key == 'choice_tables':
+                value = choice_tables.tables
+
+            yield encoder.encode(value)
 
-        return resolve_promise(form_dict)
+        yield '}'
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+
+from django_remote_forms.forms import RemoteForm
+from django_remote_forms.utils import resolve_promise
+
+# Sections of the shared form schema of a formset
+SCHEMA_SECTIONS = ('title', 'label_suffix', 'fields', 'fieldsets', 'choice_tables')
+
+
+class RemoteFormSet(object):
+    """
+    Serializes a Django FormSet.
+
+    Fields and widgets are the same for every form of a formset, so they are
+    serialized only once, from the formset's empty form, under `schema`.
+    Every form then only contributes what sets it apart: its prefix, its
+    initial values, its bound values and its errors.
+
+    Keyword arguments are passed on to the `RemoteForm` serializing the
+    schema.
+    """
+
+    def __init__(self, formset, *args, **kwargs):
+        self.formset = formset
+        self.remote_form_kwargs = kwargs
+        self.dict_class = kwargs.get('dict_class', OrderedDict)
+
+    def as_dict(self):
+        """
+        Returns a formset as a dictionary that looks like the following:
+
+        formset = {
+            'title': 'FormSet',
+            'prefix': 'form',
+            'is_bound': False,
+            'management_form': {...},
+            'non_form_errors': [],
+            'schema': {
+                'title': 'Form',
+                'label_suffix': ':',
+                'fields': {...},
+                'fieldsets': [],
+            },
+            'forms': [
+                {
+                    'prefix': 'form-0',
+                    'initial': {'name': 'value'},
+                    'data': {'name': 'value'},
+                    'errors': {'name': ['error']},
+                    'non_field_errors': [],
+                },
+            ],
+        }
+        """
+        formset_dict = self.dict_class()
+        formset_dict['title'] = self.formset.__class__.__name__
+        formset_dict['prefix'] = self.formset.prefix
+        formset_dict['is_bound'] = self.formset.is_bound
+        formset_dict['management_form'] = RemoteForm(self.formset.management_form,
+                dict_class=self.dict_class).as_dict()
+        formset_dict['non_form_errors'] = resolve_promise(self.formset.non_form_errors())
+
+        remote_form = RemoteForm(self.formset.empty_form, **self.remote_form_kwargs)
+        formset_dict['schema'] = remote_form.as_dict(sections=SCHEMA_SECTIONS)
+
+        field_names = list(formset_dict['schema']['fields'])
+
+        formset_dict['forms'] = [self.form_dict(form, field_names) for form in self.formset.forms]
+
+        return formset_dict
+
+    def form_dict(self, form, field_names):
+        """
+        Returns the per-form part of a formset form: its prefix and only the
+        initial and bound values that are actually set.
+        """
+        form_dict = self.dict_class()
+        form_dict['prefix'] = form.prefix
+
+        form_dict['initial'] = dict((name, form.initial[name]) for name in field_names if name in form.initial)
+
+        data = {}
+        if form.is_bound:
+            for name in field_names:
+                value = form.fields[name].widget.value_from_datadict(form.data, form.files, form.add_prefix(name))
+                if value is not None:
+                    data[name] = value
+        form_dict['data'] = data
+
+        form_dict['errors'] = form.errors
+        form_dict['non_field_errors'] = form.non_field_errors()
+
+        return resolve_promise(form_dict)
@@ -0,0 +1,155 @@
+import json
+import threading
+from timeit import default_timer
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.dispatch import Signal
+
+from django_remote_forms import logger
+
+# Sent by RemoteForm after serializing a field, with the form class as sender
+# and a FieldRecord as `record`. Fields are only measured while the signal has
+# receivers.
+field_serialized = Signal(providing_args=['record'])
+
+
+def is_enabled():
+    return bool(field_serialized.receivers)
+
+
+class FieldRecord(object):
+    """
+    Measurements of the serialization of a single field of a form.
+
+    `field_time` and `widget_time` are in seconds, `queries` counts the
+    database queries issued by the serializers and `size` is the length of the
+    field dictionary encoded as JSON.
+    """
+
+    def __init__(self, form, name, field_serializer, widget_serializer):
+        self.form = form
+        self.name = name
+        self.field_serializer = field_serializer.__class__ if field_serializer else None
+        self.widget_serializer = widget_serializer.__class__ if widget_serializer else None
+        self.field_time = 0.0
+        self.widget_time = 0.0
+        self.queries = 0
+        self.size = None
+
+    @property
+    def total_time(self):
+        return self.field_time + self.widget_time
+
+    def measure(self, part, func):
+        queries = len(connection.queries)
+        start = default_timer()
+
+        result = func()
+
+        setattr(self, '%s_time' % part, default_timer() - start)
+        self.queries += len(connection.queries) - queries
+        return result
+
+    def send(self, field_dict):
+        try:
+            self.size = len(json.dumps(field_dict, cls=DjangoJSONEncoder))
+        except TypeError:
+            self.size = None
+
+        field_serialized.send(sender=self.form.__class__, record=self)
+
+
+def measure(record, part, func):
+    """
+    Calls `func`, timing it as `part` of `record` unless `record` is None.
+    """
+    if record is None:
+        return func()
+
+    return record.measure(part, func)
+
+
+class capture_queries(object):
+    """
+    Makes the default connection log queries regardless of DEBUG so that
+    records can count them.
+    """
+
+    def __enter__(self):
+        self.use_debug_cursor = getattr(connection, 'use_debug_cursor', None)
+        self.force_debug_cursor = getattr(connection, 'force_debug_cursor', False)
+        connection.use_debug_cursor = connection.force_debug_cursor = True
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        connection.use_debug_cursor = self.use_debug_cursor
+        connection.force_debug_cursor = self.force_debug_cursor
+
+
+class SlowFieldLogger(object):
+    """
+    Aggregates field records per form class and field, and logs a warning for
+    every field whose serialization takes `threshold` seconds or longer.
+
+        slow_fields = SlowFieldLogger(threshold=0.05)
+        slow_fields.connect()
+        ...
+        slow_fields.log_slowest()
+    """
+
+    def __init__(self, threshold=0.05):
+        self.threshold = threshold
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def connect(self):
+        field_serialized.connect(self.record_field, weak=False, dispatch_uid=id(self))
+
+    def disconnect(self):
+        field_serialized.disconnect(dispatch_uid=id(self))
+
+    def record_field(self, sender, record, **kwargs):
+        key = (sender.__name__, record.name)
+
+        with self._lock:
+            stats = self.stats.setdefault(key, {
+                'form': sender.__name__,
+                'field': record.name,
+                'field_serializer': record.field_serializer and record.field_serializer.__name__,
+                'widget_serializer': record.widget_serializer and record.widget_serializer.__name__,
+                'count': 0,
+                'total_time': 0.0,
+                'max_time': 0.0,
+                'queries': 0,
+                'max_size': 0,
+            })
+            stats['count'] += 1
+            stats['total_time'] += record.total_time
+            stats['max_time'] = max(stats['max_time'], record.total_time)
+            stats['queries'] += record.queries
+            stats['max_size'] = max(stats['max_size'], record.size or 0)
+
+        if record.total_time >= self.threshold:
+            logger.warning('Slow field %s.%s: %.1f ms (%s %.1f ms, %s %.1f ms), %d queries, %s bytes',
+                sender.__name__, record.name, record.total_time * 1000,
+                stats['field_serializer'], record.field_time * 1000,
+                stats['widget_serializer'], record.widget_time * 1000,
+                record.queries, record.size)
+
+    def slowest(self, limit=10):
+        """
+        Returns the aggregated stats of the `limit` fields with the highest
+        mean serialization time.
+        """
+        with self._lock:
+            stats = list(self.stats.values())
+
+        stats.sort(key=lambda x: x['total_time'] / x['count'], reverse=True)
+        return stats[:limit]
+
+    def log_slowest(self, limit=10):
+        for stats in self.slowest(limit):
+            logger.info('%s.%s: %.1f ms mean, %.1f ms max over %d serializations, %.1f queries, %d bytes max',
+                stats['form'], stats['field'], stats['total_time'] / stats['count'] * 1000,
+                stats['max_time'] * 1000, stats['count'], float(stats['queries']) / stats['count'],
+                stats['max_size'])
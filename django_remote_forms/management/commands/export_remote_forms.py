@@ -0,0 +1,47 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_remote_forms.export import export_schemas
+from django_remote_forms.registry import form_registry
+from django_remote_forms.warmup import autodiscover
+
+
+class Command(BaseCommand):
+    help = ('Writes registered remote forms to JSON files named by content hash, along with a '
+            'manifest, to be served statically.')
+    args = '<directory> [form name ...]'
+
+    # Django < 1.8 parses options with optparse
+    option_list = getattr(BaseCommand, 'option_list', ()) + (
+        make_option('--language', action='append', dest='languages',
+                help=('Language to export forms in, may be repeated. Defaults to REMOTE_FORMS_LANGUAGES or '
+                        'LANGUAGE_CODE.')),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory')
+        parser.add_argument('names', nargs='*')
+        parser.add_argument('--language', action='append', dest='languages',
+                help=('Language to export forms in, may be repeated. Defaults to REMOTE_FORMS_LANGUAGES or '
+                        'LANGUAGE_CODE.'))
+
+    def handle(self, *args, **options):
+        if args:
+            directory, names = args[0], list(args[1:])
+        else:
+            directory, names = options.get('directory'), options.get('names')
+
+        if not directory:
+            raise CommandError('Enter the directory to export forms to')
+
+        autodiscover()
+
+        for name in names or ():
+            if name not in form_registry:
+                raise CommandError('Unknown remote form %s' % name)
+
+        written = export_schemas(directory, names or None, options.get('languages'))
+        for filename in written:
+            self.stdout.write('Wrote %s\n' % filename)
+        self.stdout.write('%d files written\n' % len(written))
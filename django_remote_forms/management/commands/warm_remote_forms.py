@@ -0,0 +1,41 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_remote_forms.registry import form_registry
+from django_remote_forms.warmup import autodiscover, warm_schemas
+
+
+class Command(BaseCommand):
+    help = ('Builds the schemas of registered remote forms in every language and stores them in the '
+            'shared schema cache.')
+    args = '[form name ...]'
+
+    # Django < 1.8 parses options with optparse
+    option_list = getattr(BaseCommand, 'option_list', ()) + (
+        make_option('--language', action='append', dest='languages',
+                help=('Language to build schemas in, may be repeated. Defaults to REMOTE_FORMS_LANGUAGES or '
+                        'LANGUAGE_CODE.')),
+        make_option('--rebuild', action='store_true', dest='rebuild', default=False,
+                help='Build schemas even if the shared schema cache has them.'),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*')
+        parser.add_argument('--language', action='append', dest='languages',
+                help=('Language to build schemas in, may be repeated. Defaults to REMOTE_FORMS_LANGUAGES or '
+                        'LANGUAGE_CODE.'))
+        parser.add_argument('--rebuild', action='store_true', dest='rebuild', default=False,
+                help='Build schemas even if the shared schema cache has them.')
+
+    def handle(self, *args, **options):
+        autodiscover()
+
+        names = list(args) or options.get('names') or None
+
+        for name in names or ():
+            if name not in form_registry:
+                raise CommandError('Unknown remote form %s' % name)
+
+        warmed = warm_schemas(names, options.get('languages'), options.get('rebuild'))
+        self.stdout.write('Warmed %d schemas\n' % warmed)
@@ -0,0 +1,96 @@
+from collections import namedtuple
+
+from django_remote_forms import logger
+
+# Everything RemoteForm needs to know to serialize one field, decided once per
+# plan. The serializer classes only apply to fields that are still instances
+# of `field_class` and `widget_class`, since forms may swap fields and widgets
+# in __init__.
+PlanStep = namedtuple('PlanStep', [
+    'name',
+    'field_class',
+    'widget_class',
+    'remote_field_class',
+    'remote_widget_class',
+    'readonly',
+    'label_field',
+    'choice_pagination',
+    'choice_cache',
+])
+
+
+class FieldsetLayout(object):
+    """
+    The fieldsets of a form's Meta, compiled once per plan: field names that
+    are not serialized are dropped, along with fieldsets left without fields,
+    and `field_index` maps every field name to the key of its fieldset.
+
+    The layout is shared and never changed; `as_list` returns new
+    dictionaries on every call.
+    """
+
+    __slots__ = ('fieldsets', 'field_index')
+
+    def __init__(self, fieldsets, fields, all_fields):
+        fields = frozenset(fields)
+
+        compiled = []
+        self.field_index = {}
+        for key, data in fieldsets:
+            items = []
+            for name, value in data.items():
+                if name == 'fields':
+                    unknown = [x for x in value if x not in all_fields]
+                    if unknown:
+                        logger.warning('Fieldset %s fields %s are not present in form fields' % (key, unknown))
+
+                    value = tuple(x for x in value if x in fields)
+                    if not value:
+                        break
+
+                    for field_name in value:
+                        self.field_index[field_name] = key
+                elif isinstance(value, list):
+                    value = tuple(value)
+
+                items.append((name, value))
+            else:
+                compiled.append((key, tuple(items)))
+
+        self.fieldsets = tuple(compiled)
+
+    def as_list(self):
+        """
+        Returns the fieldsets as in `RemoteForm.as_dict`, a list of the Meta
+        dictionaries with their `key` added.
+        """
+        fieldset_list = []
+        for key, items in self.fieldsets:
+            fieldset_data = dict(items)
+            fieldset_data['key'] = key
+            fieldset_list.append(fieldset_data)
+        return fieldset_list
+
+
+class FormPlan(object):
+    """
+    The validated field lists of a RemoteForm and the ordered steps to
+    serialize its fields, compiled once per form class, set of form fields,
+    config and include/exclude/readonly/ordering arguments. Plans are shared
+    between RemoteForm instances and must be treated as read-only.
+    """
+
+    __slots__ = ('all_fields', 'excluded_fields', 'included_fields', 'readonly_fields',
+            'ordered_fields', 'fields', 'steps', 'step_map', 'fieldsets')
+
+    def __init__(self, all_fields, excluded_fields, included_fields, readonly_fields, ordered_fields, steps,
+            fieldsets=()):
+        self.all_fields = all_fields
+        self.excluded_fields = excluded_fields
+        self.included_fields = included_fields
+        self.readonly_fields = readonly_fields
+        self.ordered_fields = ordered_fields
+        self.steps = steps
+        self.fields = tuple(step.name for step in steps)
+        self.step_map = dict((step.name, step) for step in steps)
+        self.fieldsets = FieldsetLayout(fieldsets, self.fields, all_fields)
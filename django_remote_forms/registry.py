@@ -0,0 +1,123 @@
+from collections import OrderedDict
+
+from django_remote_forms import fields, widgets
+from django_remote_forms.cache import invalidate_schema
+from django_remote_forms.utils import freeze
+
+
+class SerializerRegistry(object):
+    """
+    Maps Django field or widget classes to their Remote Forms serializers.
+
+    A class is resolved by walking its MRO and taking the first class that has
+    a serializer, either registered explicitly with `register` or found in
+    `module` by the `Remote<ClassName>` naming convention. Custom subclasses
+    therefore fall back to the serializer of their nearest known base, e.g. a
+    `SlugishField(CharField)` is serialized by `RemoteCharField`.
+
+    Results are memoized per concrete class and set of overrides.
+    """
+
+    def __init__(self, module):
+        self.module = module
+        self._registry = {}
+        self._memos = {}
+
+    def register(self, klass, serializer):
+        self._registry[klass] = serializer
+        self.reset()
+
+    def unregister(self, klass):
+        self._registry.pop(klass, None)
+        self.reset()
+
+    def reset(self):
+        # Compiled plans and cached schemas hold resolved serializers too
+        self._memos = {}
+        invalidate_schema()
+
+    def bind(self, overrides=None):
+        """
+        Returns a resolver that checks `overrides`, a dictionary of class
+        names to serializers as passed in `RemoteForm` config, before the
+        registry at every step of the MRO.
+        """
+        overrides = overrides or {}
+        memo = self._memos.setdefault(freeze(overrides), {})
+        return BoundSerializerRegistry(self, overrides, memo)
+
+    def resolve(self, klass):
+        return self.bind().resolve(klass)
+
+    def lookup(self, klass, overrides):
+        for base in klass.__mro__:
+            serializer = overrides.get(base.__name__)
+            if serializer is None:
+                serializer = self._registry.get(base)
+            if serializer is None:
+                serializer = getattr(self.module, 'Remote%s' % base.__name__, None)
+            if serializer is not None:
+                return serializer
+
+        return None
+
+
+class BoundSerializerRegistry(object):
+    def __init__(self, registry, overrides, memo):
+        self.registry = registry
+        self.overrides = overrides
+        self.memo = memo
+
+    def resolve(self, klass):
+        try:
+            return self.memo[klass]
+        except KeyError:
+            serializer = self.memo[klass] = self.registry.lookup(klass, self.overrides)
+            return serializer
+
+
+field_registry = SerializerRegistry(fields)
+widget_registry = SerializerRegistry(widgets)
+
+
+class FormRegistry(object):
+    """
+    Forms declared as remotable, by name, along with the keyword arguments
+    to serialize them with. Registered forms are what the schema warmup and
+    export work on.
+    """
+
+    def __init__(self):
+        self._forms = OrderedDict()
+
+    def register(self, form_class=None, name=None, **kwargs):
+        """
+        Registers `form_class` under `name`, which defaults to the class
+        name. `kwargs` are passed to `RemoteForm`, e.g. `config` or
+        `exclude`. Can be used as a class decorator, with or without
+        arguments.
+        """
+        if form_class is None:
+            return lambda form_class: self.register(form_class, name, **kwargs)
+
+        self._forms[name or form_class.__name__] = (form_class, kwargs)
+        return form_class
+
+    def unregister(self, name):
+        self._forms.pop(name, None)
+
+    def get(self, name):
+        return self._forms[name]
+
+    def items(self):
+        return self._forms.items()
+
+    def __contains__(self, name):
+        return name in self._forms
+
+    def __len__(self):
+        return len(self._forms)
+
+
+form_registry = FormRegistry()
+register_form = form_registry.register
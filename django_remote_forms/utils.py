@@ -1,22 +1,155 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils.functional import Promise
 from django.utils.encoding import force_unicode
+from django.utils.translation import get_language
+
+try:
+    from django.core.cache import caches
+except ImportError:
+    # Django < 1.7
+    from django.core.cache import get_cache
+else:
+    get_cache = caches.__getitem__
+
+# Values that can never hold a promise
+SCALAR_TYPES = (basestring, int, long, float, type(None))
+
+# Maximum number of resolved lazy strings kept in memory
+LAZY_CACHE_SIZE = 4096
+
+_lazy_cache = {}
+
+
+def resolve_lazy(o, language=None):
+    """
+    Returns the value of the lazy object `o` in `language`, which defaults to
+    the active language.
+
+    Lazy strings are mostly module level translations shared by every field
+    of a class, e.g. default error messages, so resolved strings are memoized
+    per promise and language.
+    """
+    if language is None:
+        language = get_language()
+
+    key = (id(o), language)
+    try:
+        return _lazy_cache[key][1]
+    except KeyError:
+        pass
+
+    try:
+        value = force_unicode(o)
+    except (TypeError, ValueError):
+        # Item could be a lazy tuple or list
+        try:
+            return list(o)
+        except TypeError:
+            raise Exception('Unable to resolve lazy object %s' % o)
+
+    if len(_lazy_cache) >= LAZY_CACHE_SIZE:
+        _lazy_cache.clear()
+
+    # Keep a reference to the promise so that its id is not reused while the
+    # entry is cached
+    _lazy_cache[key] = (o, value)
+    return value
+
+
+class ResolvedList(list):
+    """
+    A list known to hold no lazy objects or callables at any depth, which
+    `resolve_promise` therefore skips.
+    """
+
 
 def resolve_promise(o):
+    """
+    Resolves the lazy objects and callables found anywhere in `o`.
+
+    Dictionaries and lists are updated in place, and only where a value
+    actually changes, so immutable dictionaries without promises such as a
+    QueryDict pass through untouched. Tuples are replaced by lists. The tree
+    is walked without recursion, a container referenced several times is only
+    walked once and instances of `ResolvedList` are not walked at all.
+    """
+    language = get_language()
+
+    root = [o]
+    stack = [root]
+    seen = set()
+
+    while stack:
+        container = stack.pop()
+
+        if isinstance(container, dict):
+            items = container.items()
+        else:
+            items = enumerate(container)
+
+        for key, value in items:
+            if isinstance(value, SCALAR_TYPES):
+                continue
+            elif isinstance(value, dict):
+                resolved = value
+            elif isinstance(value, list):
+                if isinstance(value, ResolvedList):
+                    continue
+                resolved = value
+            elif isinstance(value, tuple):
+                resolved = container[key] = list(value)
+            elif isinstance(value, Promise):
+                resolved = container[key] = resolve_lazy(value, language)
+            elif callable(value):
+                resolved = container[key] = value()
+                continue
+            else:
+                continue
+
+            if isinstance(resolved, (dict, list)) and id(resolved) not in seen:
+                seen.add(id(resolved))
+                stack.append(resolved)
+
+    return root[0]
+
+
+def freeze(o):
+    """
+    Returns a hashable equivalent of `o` so it can be used in cache keys.
+    """
     if isinstance(o, dict):
-        for k, v in o.items():
-            o[k] = resolve_promise(v)
+        return tuple(sorted((k, freeze(v)) for k, v in o.items()))
     elif isinstance(o, (list, tuple)):
-        o = [resolve_promise(x) for x in o]
-    elif isinstance(o, Promise):
-        try:
-            o = force_unicode(o)
-        except:
-            # Item could be a lazy tuple or list
-            try:
-                o = [resolve_promise(x) for x in o]
-            except:
-                raise Exception('Unable to resolve lazy object %s' % o)
-    elif callable(o):
-            o = o()
+        return tuple(freeze(x) for x in o)
+    elif isinstance(o, (set, frozenset)):
+        return frozenset(freeze(x) for x in o)
 
     return o
+
+
+class FingerprintEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # Classes, e.g. serializer overrides in a config
+        if isinstance(o, type):
+            return '%s.%s' % (o.__module__, o.__name__)
+
+        # Model instances, e.g. in initial data, are identified by their key
+        if hasattr(o, '_get_pk_val'):
+            return '%s.%s:%s' % (o.__class__.__module__, o.__class__.__name__, o._get_pk_val())
+
+        try:
+            return super(FingerprintEncoder, self).default(o)
+        except TypeError:
+            # Stand in for objects without a JSON representation, e.g. the
+            # subfields of a ComboField
+            return '%s.%s' % (o.__class__.__module__, o.__class__.__name__)
+
+
+def fingerprint(*parts):
+    """
+    Returns a stable hash of the JSON representation of `parts`.
+    """
+    return hashlib.md5(json.dumps(parts, cls=FingerprintEncoder, sort_keys=True)).hexdigest()
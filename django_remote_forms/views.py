@@ -0,0 +1,110 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+
+from django_remote_forms.choices import paginate_choices
+from django_remote_forms.delta import diff, schema_history
+from django_remote_forms.utils import resolve_promise
+
+
+def paginated_choices(request, form_class, field_name, page_size=50, search_fields=(), label_field=None):
+    """
+    Serves the choices of a model backed field that `RemoteForm` only inlines
+    partially, see the `paginated_choices` config. Accepts `cursor` and `q`
+    GET parameters and responds with the `choices` of the page and the
+    `next_cursor`.
+
+    Meant to be hooked up with the same options as given in the config:
+
+        url(r'^choices/country/$', paginated_choices, {
+            'form_class': AddressForm,
+            'field_name': 'country',
+            'search_fields': ['name'],
+        })
+    """
+    form = form_class()
+    try:
+        field = form.fields[field_name]
+    except KeyError:
+        raise Http404
+
+    if not hasattr(field, 'queryset'):
+        raise Http404
+
+    page = paginate_choices(field, cursor=request.GET.get('cursor'), search=request.GET.get('q'),
+            page_size=page_size, search_fields=search_fields, label_field=label_field)
+
+    return HttpResponse(json.dumps(resolve_promise(page), cls=DjangoJSONEncoder),
+            content_type='application/json')
+
+
+def remote_form_response(request, remote_form, deltas=False):
+    """
+    Returns a JSON response with the serialized `remote_form` and its
+    fingerprint, which is also sent as ETag. A GET or HEAD request for an
+    unbound form whose If-None-Match matches the fingerprint gets an empty
+    304 response instead, so clients can keep using their cached copy.
+
+    With `deltas`, served unbound forms are kept in the schema history, and
+    a GET request passing the fingerprint of a form still in the history as
+    `since` parameter is answered with the `fingerprint` of the current form,
+    the fingerprint it is relative to as `since`, and a JSON Patch turning
+    that form into the current one as `patch`.
+    """
+    # Without a schema cache the fingerprint is the hash of the serialized
+    # form, so the form is serialized first
+    form_dict = None
+    if not remote_form.cache_schema:
+        form_dict = remote_form.as_dict()
+
+    fingerprint = remote_form.get_fingerprint(form_dict)
+    etag = quote_etag(fingerprint)
+
+    if request.method in ('GET', 'HEAD') and not remote_form.form.is_bound:
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and (fingerprint in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+
+    if form_dict is None:
+        form_dict = remote_form.as_dict()
+    form_dict['fingerprint'] = fingerprint
+
+    if deltas and not remote_form.form.is_bound:
+        schema_history.add(fingerprint, form_dict)
+
+        since = request.GET.get('since')
+        base = schema_history.get(since) if since else None
+        if base is not None:
+            form_dict = {
+                'fingerprint': fingerprint,
+                'since': since,
+                'patch': diff(base, form_dict),
+            }
+
+    response = HttpResponse(json.dumps(form_dict, cls=DjangoJSONEncoder),
+            content_type='application/json')
+    response['ETag'] = etag
+    return response
+
+
+def validate_fields_response(request, remote_form):
+    """
+    Returns a JSON response with the `errors` of only the fields named by the
+    `fields` parameters of a POST request, validated against the POSTed
+    data, see `RemoteForm.validate_fields`. Meant for validating fields as the
+    user types:
+
+        def validate_signup(request):
+            return validate_fields_response(request, RemoteForm(SignupForm()))
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    errors = remote_form.validate_fields(request.POST.getlist('fields'), request.POST, request.FILES)
+
+    return HttpResponse(json.dumps({'errors': errors}, cls=DjangoJSONEncoder),
+            content_type='application/json')
@@ -0,0 +1,76 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.utils import translation
+from django.utils.module_loading import module_has_submodule
+
+from django_remote_forms import logger
+from django_remote_forms.cache import schema_cache, shared_schema_cache
+from django_remote_forms.forms import RemoteForm
+from django_remote_forms.registry import form_registry
+
+
+def autodiscover(module_name='forms'):
+    """
+    Imports `module_name` of every installed app, so that the forms they
+    register are known.
+    """
+    for app in settings.INSTALLED_APPS:
+        app_module = import_module(app)
+        if module_has_submodule(app_module, module_name):
+            import_module('%s.%s' % (app, module_name))
+
+
+def get_languages():
+    """
+    Returns the codes of the languages forms are served in: the
+    `REMOTE_FORMS_LANGUAGES` setting, or else `LANGUAGE_CODE`. Django's
+    default `LANGUAGES` lists every language Django is translated to, so it
+    is not used unless given explicitly.
+    """
+    languages = getattr(settings, 'REMOTE_FORMS_LANGUAGES', None)
+    if languages is not None:
+        return list(languages)
+
+    return [settings.LANGUAGE_CODE]
+
+
+def warm_schemas(names=None, languages=None, rebuild=False):
+    """
+    Loads the schemas of the registered forms, or those in `names`, in every
+    language of `languages` into the schema cache of this process, building
+    them and storing them in the shared schema cache unless they are found
+    there. With `rebuild`, schemas are built and stored even if they are
+    found, e.g. after form definitions changed.
+
+    Forms that fail to instantiate or serialize are logged and skipped.
+    Returns the number of schemas loaded.
+    """
+    if names is None:
+        names = [name for name, entry in form_registry.items()]
+
+    if languages is None:
+        languages = get_languages()
+
+    warmed = 0
+    for name in names:
+        form_class, kwargs = form_registry.get(name)
+        kwargs = dict(kwargs, cache_schema=True)
+
+        for language in languages:
+            with translation.override(language):
+                try:
+                    remote_form = RemoteForm(form_class(), **kwargs)
+                    if rebuild:
+                        schema = remote_form.build_schema()
+                        shared_schema_cache.set(remote_form.get_shared_schema_key(), schema)
+                        schema_cache.set(remote_form.get_schema_key(), schema)
+                    else:
+                        remote_form.get_schema()
+                except Exception, e:
+                    logger.warning('Error warming schema of form %s in %s: %s', name, language, str(e))
+                    continue
+
+            warmed += 1
+
+    return warmed
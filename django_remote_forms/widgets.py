@@ -1,15 +1,113 @@
 from collections import OrderedDict
+import time
 
 from django.utils.dates import MONTHS
+from django.utils.translation import get_language
+
+from django_remote_forms.choices import choice_dicts, choice_table_id, static_choice_dicts
+from django_remote_forms.utils import ResolvedList, resolve_lazy
+
+# Maximum number of date select tables kept in memory, see `date_selects`
+DATE_SELECTS_CACHE_SIZE = 256
+
+# Seconds the result of a callable `years` of a date widget is reused
+YEARS_TTL = 1.0
+
+_date_selects_cache = {}
+_years_cache = {}
+
+
+def get_years(years):
+    """
+    Returns the years of a date widget as a tuple. Callable `years` are
+    called at most once every `YEARS_TTL` seconds.
+    """
+    if not callable(years):
+        return tuple(years)
+
+    now = time.time()
+    try:
+        called_at, result = _years_cache[years]
+        if now - called_at < YEARS_TTL:
+            return result
+    except KeyError:
+        pass
+
+    result = tuple(years())
+
+    if len(_years_cache) >= DATE_SELECTS_CACHE_SIZE:
+        _years_cache.clear()
+
+    _years_cache[years] = (now, result)
+    return result
+
+
+def date_selects(years, required, none_value):
+    """
+    Returns the day, month and year selects of a date widget in the active
+    language. Selects and their choice table id are memoized per language,
+    years, required and empty value, and only copied for every widget using
+    them.
+    """
+    language = get_language()
+    key = (language, years, required, none_value)
+    try:
+        return copy_date_selects(_date_selects_cache[key])
+    except KeyError:
+        pass
+
+    def create_select(name, choices):
+        if not required:
+            choices.insert(0, [none_value[0], resolve_lazy(none_value[1], language)])
+
+        return {
+            'title': name,
+            'data': choices,
+        }
+
+    selects = ResolvedList([
+        create_select('day', [{'key': "%02d" % i, 'value': i} for i in range(1, 32)]),
+        create_select('month', [{'key': "%02d" % i, 'value': resolve_lazy(j, language)}
+                for (i, j) in MONTHS.iteritems()]),
+        create_select('year', [{'key': "%s" % i, 'value': i} for i in years]),
+    ])
+
+    choice_table_id(selects)
+
+    if len(_date_selects_cache) >= DATE_SELECTS_CACHE_SIZE:
+        _date_selects_cache.clear()
+
+    _date_selects_cache[key] = selects
+    return copy_date_selects(selects)
+
+
+def copy_date_selects(selects):
+    """
+    Copies the selects returned by `date_selects` down to their choices,
+    keeping their choice table id.
+    """
+    copied = ResolvedList()
+    for select in selects:
+        copied.append({
+            'title': select['title'],
+            'data': [list(x) if isinstance(x, list) else dict(x) for x in select['data']],
+        })
+
+    copied.table_id = selects.table_id
+    return copied
 
 class RemoteWidget(object):
+    # See RemoteField for why serializers use slots
+    __slots__ = ('widget', 'name', 'required', 'dict_class')
+
     def __init__(self, widget, name=None, required=False):
         self.widget = widget
         self.name = name or self.widget.__class__.__name__
         self.required = required
+        self.dict_class = OrderedDict
 
     def as_dict(self):
-        widget_dict = OrderedDict()
+        widget_dict = self.dict_class()
         widget_dict['title'] = self.name
         widget_dict['is_hidden'] = self.widget.is_hidden
         widget_dict['needs_multipart_form'] = self.widget.needs_multipart_form
@@ -19,7 +117,16 @@ class RemoteWidget(object):
 
         return widget_dict
 
+    def dynamic_dict(self):
+        """
+        Returns the part of `as_dict` that may differ between two instances of
+        the same form class, see `RemoteField.dynamic_dict`.
+        """
+        return {}
+
 class RemoteInput(RemoteWidget):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteInput, self).as_dict()
         try:
@@ -30,28 +137,28 @@ class RemoteInput(RemoteWidget):
         return widget_dict
 
 class RemoteTextInput(RemoteInput):
-    def as_dict(self):
-        return super(RemoteTextInput, self).as_dict()
+    __slots__ = ()
 
 class RemotePasswordInput(RemoteInput):
-    def as_dict(self):
-        return super(RemotePasswordInput, self).as_dict()
+    __slots__ = ()
 
 class RemoteHiddenInput(RemoteInput):
-    def as_dict(self):
-        return super(RemoteHiddenInput, self).as_dict()
+    __slots__ = ()
 
 class RemoteMultipleHiddenInput(RemoteHiddenInput):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteMultipleHiddenInput, self).as_dict()
         widget_dict['choices'] = self.choices
         return widget_dict
 
 class RemoteFileInput(RemoteInput):
-    def as_dict(self):
-        return super(RemoteFileInput, self).as_dict()
+    __slots__ = ()
 
 class RemoteClearableFileInput(RemoteFileInput):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteClearableFileInput, self).as_dict()
         widget_dict['initial_text'] = self.initial_text
@@ -60,12 +167,16 @@ class RemoteClearableFileInput(RemoteFileInput):
         return widget_dict
 
 class RemoteTextarea(RemoteInput):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteTextarea, self).as_dict()
         widget_dict['input_type'] = 'textarea'
         return widget_dict
 
 class RemoteTimeInput(RemoteWidget):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteTimeInput, self).as_dict()
 
@@ -76,37 +187,26 @@ class RemoteTimeInput(RemoteWidget):
         return widget_dict
 
 class RemoteDateInput(RemoteWidget):
-    def create_select(self, name, choices):
-        if not self.required:
-            choices.insert(0, self.widget.none_value)
-
-        return {
-            'title': name,
-            'data': choices,
-        }
+    __slots__ = ()
 
     def as_dict(self):
         widget_dict = super(RemoteDateInput, self).as_dict()
 
         widget_dict['input_type'] = 'date'
 
-        years = self.widget.years
-        if not callable(self.widget.years):
-            years = lambda: self.widget.years
-
-        choices = [{'key': "%02d" % i, 'value': i} for i in range(1, 32)]
-        day_choices = self.create_select('day', choices)
-
-        choices = [{'key': "%02d" % i, 'value': j} for (i, j) in MONTHS.iteritems()]
-        month_choices = self.create_select('month', choices)
-
-        choices = [{'key': "%s" % i, 'value': i} for i in years()]
-        year_choices = self.create_select('year', choices)
+        # Day, month and year selects of a SelectDateWidget
+        if hasattr(self.widget, 'years'):
+            widget_dict['choices'] = date_selects(get_years(self.widget.years), self.required,
+                    tuple(getattr(self.widget, 'none_value', (0, '---'))))
 
-        widget_dict['choices'] = [day_choices, month_choices, year_choices]
         return widget_dict
 
+class RemoteSelectDateWidget(RemoteDateInput):
+    __slots__ = ()
+
 class RemoteDateTimeInput(RemoteWidget):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteDateTimeInput, self).as_dict()
 
@@ -114,6 +214,8 @@ class RemoteDateTimeInput(RemoteWidget):
         return widget_dict
 
 class RemoteCheckboxInput(RemoteWidget):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteCheckboxInput, self).as_dict()
 
@@ -127,24 +229,41 @@ class RemoteCheckboxInput(RemoteWidget):
         return widget_dict
 
 class RemoteSelect(RemoteWidget):
+    __slots__ = ('choices_from',)
+
+    def __init__(self, *args, **kwargs):
+        super(RemoteSelect, self).__init__(*args, **kwargs)
+
+        # Field serializer with the same choices as the widget, set by
+        # RemoteForm so that choices are only materialized once
+        self.choices_from = None
+
+    def get_choices(self):
+        if self.choices_from is not None:
+            return self.choices_from.get_choices()
+
+        if isinstance(self.widget.choices, list):
+            return static_choice_dicts(self.widget.choices)
+
+        return choice_dicts(self.widget.choices)
+
     def as_dict(self):
         widget_dict = super(RemoteSelect, self).as_dict()
         widget_dict['input_type'] = 'select'
 
-        widget_dict['choices'] = []
-        for key, value in self.widget.choices:
-            widget_dict['choices'].append({
-                'value': key,
-                'display': value
-            })
+        widget_dict['choices'] = self.get_choices()
 
         return widget_dict
 
+    def dynamic_dict(self):
+        return {'choices': self.get_choices()}
+
 class RemoteNullBooleanSelect(RemoteSelect):
-    def as_dict(self):
-        return super(RemoteNullBooleanSelect, self).as_dict()
+    __slots__ = ()
 
 class RemoteSelectMultiple(RemoteSelect):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteSelectMultiple, self).as_dict()
 
@@ -152,9 +271,16 @@ class RemoteSelectMultiple(RemoteSelect):
         widget_dict['size'] = len(widget_dict['choices'])
         return widget_dict
 
+    def dynamic_dict(self):
+        dynamic_dict = super(RemoteSelectMultiple, self).dynamic_dict()
+        dynamic_dict['size'] = len(dynamic_dict['choices'])
+        return dynamic_dict
+
 class RemoteRadioInput(RemoteWidget):
+    __slots__ = ()
+
     def as_dict(self):
-        widget_dict = OrderedDict()
+        widget_dict = self.dict_class()
         widget_dict['title'] = self.__class__.__name__
         widget_dict['name'] = self.name
         widget_dict['value'] = self.value
@@ -166,8 +292,10 @@ class RemoteRadioInput(RemoteWidget):
         return widget_dict
 
 class RemoteRadioFieldRenderer(RemoteWidget):
+    __slots__ = ()
+
     def as_dict(self):
-        widget_dict = OrderedDict()
+        widget_dict = self.dict_class()
         widget_dict['title'] = self.__class__.__name__
         widget_dict['name'] = self.name
         widget_dict['value'] = self.value
@@ -177,6 +305,8 @@ class RemoteRadioFieldRenderer(RemoteWidget):
         return widget_dict
 
 class RemoteRadioSelect(RemoteSelect):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteRadioSelect, self).as_dict()
 
@@ -192,10 +322,11 @@ class RemoteRadioSelect(RemoteSelect):
         return widget_dict
 
 class RemoteCheckboxSelectMultiple(RemoteSelectMultiple):
-    def as_dict(self):
-        return super(RemoteCheckboxSelectMultiple, self).as_dict()
+    __slots__ = ()
 
 class RemoteMultiWidget(RemoteWidget):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteMultiWidget, self).as_dict()
 
@@ -208,6 +339,8 @@ class RemoteMultiWidget(RemoteWidget):
         return widget_dict
 
 class RemoteSplitDateTimeWidget(RemoteMultiWidget):
+    __slots__ = ()
+
     def as_dict(self):
         widget_dict = super(RemoteSplitDateTimeWidget, self).as_dict()
 
@@ -217,5 +350,4 @@ class RemoteSplitDateTimeWidget(RemoteMultiWidget):
         return widget_dict
 
 class RemoteSplitHiddenDateTimeWidget(RemoteSplitDateTimeWidget):
-    def as_dict(self):
-        return super(RemoteSplitHiddenDateTimeWidget, self).as_dict()
+    __slots__ = ()
@@ -17,6 +17,8 @@ setup(
     long_description=open('README.md', 'r').read(),
     packages=[
         'django_remote_forms',
+        'django_remote_forms.management',
+        'django_remote_forms.management.commands',
     ],
     package_data={
     },